@@ -0,0 +1,266 @@
+"""Бенчмарки загрузки и запросов.
+
+Запуск: python -m benchmarks.run --vacancies 100000 --latency 0.05 --output bench.json
+
+API hh.ru заменяется локальной заглушкой с синтетическими данными.
+Бенчмарки базы данных используют PostgreSQL из переменных окружения
+(BENCH_DB_NAME, DB_HOST, DB_PORT, DB_USER, DB_PASSWORD) и очищают
+ее таблицы, поэтому для них нужна отдельная база.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import chain, islice
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from dotenv import load_dotenv
+
+from benchmarks.stub_server import StubHhProcess
+from benchmarks.synthetic import (
+    MAX_VACANCIES_PER_EMPLOYER,
+    generate_employer,
+    generate_vacancies,
+    split_vacancies,
+)
+from src.api import HhApiClient
+from src.db_manager import DBManager
+from src.file_manager import FileManager
+from src.pipeline import VacancyPipeline
+from src.salary import CurrencyRates, normalize_vacancies
+
+
+class NullDBManager:
+    """Приемник пачек без записи, чтобы измерять только загрузку из API."""
+
+    def insert_vacancy_rows(self, rows, company_id, batch_size=1000):
+        return len(rows)
+
+
+def make_employers(vacancies: int, employers: int) -> Dict[str, int]:
+    """Строит словарь {ID компании: число вакансий} для заглушки."""
+    counts = split_vacancies(vacancies, employers)
+    return {str(100000 + i): count for i, count in enumerate(counts)}
+
+
+def bench_api_harvest(employers: Dict[str, int], latency: float, workers: int) -> Dict:
+    """Пропускная способность загрузки вакансий из API.
+    Заглушка работает в отдельном процессе и не конкурирует с клиентом за GIL.
+    """
+    with StubHhProcess(employers, latency) as stub:
+        with HhApiClient(base_url=stub.base_url, max_workers=workers) as client:
+
+            def harvest(employer_id: str) -> int:
+                return sum(len(page) for page in client.iter_vacancy_pages(employer_id))
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                count = sum(executor.map(harvest, employers))
+            elapsed = time.perf_counter() - start
+    return {
+        "vacancies": count,
+        "requests": stub.requests,
+        "seconds": round(elapsed, 3),
+        "vacancies_per_sec": round(count / elapsed, 1),
+        "requests_per_sec": round(stub.requests / elapsed, 1),
+    }
+
+
+def bench_pipeline_memory(scales: List[int], workers: int) -> Dict:
+    """Пиковое потребление памяти потоковым конвейером при росте объема.
+
+    Для каждого масштаба конвейер последовательно загружает столько
+    компаний с полной выдачей (MAX_VACANCIES_PER_EMPLOYER вакансий).
+    Заглушка работает в отдельном процессе, поэтому tracemalloc учитывает
+    только клиент и конвейер. При потоковой обработке пик не должен
+    расти вместе с числом вакансий: peak_ratio - отношение пика
+    на самом большом масштабе к пику на самом маленьком.
+    """
+    employer_ids = [str(200000 + i) for i in range(max(scales))]
+    employers = {employer_id: MAX_VACANCIES_PER_EMPLOYER for employer_id in employer_ids}
+    results = []
+    with StubHhProcess(employers) as stub:
+        with HhApiClient(base_url=stub.base_url, max_workers=workers) as client:
+            pipeline = VacancyPipeline(client, NullDBManager())
+            for scale in sorted(scales):
+                tracemalloc.start()
+                try:
+                    count = sum(
+                        pipeline.run(employer_id, 1)
+                        for employer_id in employer_ids[:scale]
+                    )
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                results.append(
+                    {
+                        "employers": scale,
+                        "vacancies": count,
+                        "peak_memory_mb": round(peak / 2**20, 2),
+                    }
+                )
+    return {
+        "scales": results,
+        "peak_ratio": round(
+            results[-1]["peak_memory_mb"] / results[0]["peak_memory_mb"], 2
+        ),
+    }
+
+
+def bench_salary_normalization(employers: Dict[str, int], batch_size: int = 1000) -> Dict:
+    """Скорость пакетной нормализации зарплат с пересчетом валют.
+
+    Вакансии всех компаний генерируются потоком и нормализуются пачками
+    по batch_size; время генерации в замер не входит.
+    """
+    rates = CurrencyRates({"USD": 0.011, "EUR": 0.0102})
+    vacancies = chain.from_iterable(
+        generate_vacancies(employer_id, count) for employer_id, count in employers.items()
+    )
+    count = 0
+    elapsed = 0.0
+    while batch := list(islice(vacancies, batch_size)):
+        start = time.perf_counter()
+        normalize_vacancies(batch, rates)
+        elapsed += time.perf_counter() - start
+        count += len(batch)
+    return {
+        "vacancies": count,
+        "seconds": round(elapsed, 3),
+        "vacancies_per_sec": round(count / elapsed, 1),
+    }
+
+
+def bench_db_ingest(db_manager: DBManager, employers: Dict[str, int]) -> Dict:
+    """Скорость записи вакансий в базу данных."""
+    db_manager.create_database()
+    db_manager.create_tables()
+    db_manager.clear_database()
+    start = time.perf_counter()
+    company_ids = db_manager.insert_companies_bulk(
+        generate_employer(employer_id) for employer_id in employers
+    )
+    rows = 0
+    for (employer_id, count), company_id in zip(employers.items(), company_ids):
+        rows += db_manager.insert_vacancies_bulk(
+            generate_vacancies(employer_id, count), company_id
+        )
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed, 1),
+    }
+
+
+def _latency(func: Callable, repeats: int) -> Dict:
+    """Замеряет время вызова func в миллисекундах."""
+    timings: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 3),
+        "min_ms": round(timings[0], 3),
+    }
+
+
+def bench_queries(db_manager: DBManager, repeats: int) -> Dict:
+    """Задержка запросов статистики и аналитики."""
+    queries = {
+        "get_statistics": db_manager.get_statistics,
+        "get_avg_salary": db_manager.get_avg_salary,
+        "get_companies_and_vacancies_count": lambda: (
+            db_manager.get_companies_and_vacancies_count(limit=100)
+        ),
+        "get_vacancies_with_higher_salary": lambda: (
+            db_manager.get_vacancies_with_higher_salary(limit=100)
+        ),
+        "get_vacancies_with_keyword": lambda: (
+            db_manager.get_vacancies_with_keyword("python", limit=100)
+        ),
+    }
+    return {name: _latency(func, repeats) for name, func in queries.items()}
+
+
+def _git_revision() -> str:
+    """Возвращает хэш текущего коммита или пустую строку."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    """Запускает бенчмарки и выводит результаты в формате JSON."""
+    parser = argparse.ArgumentParser(description="Бенчмарки загрузки и запросов.")
+    parser.add_argument("--vacancies", type=int, default=10000)
+    parser.add_argument("--employers", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument(
+        "--memory-scales",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16],
+        help="Числа компаний для замера памяти конвейера.",
+    )
+    parser.add_argument(
+        "--skip-db", action="store_true", help="Не запускать бенчмарки базы данных."
+    )
+    parser.add_argument("--output", default=None, help="Файл для результатов.")
+    args = parser.parse_args()
+
+    employers = make_employers(args.vacancies, args.employers)
+    report = {
+        "revision": _git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": {**vars(args), "employers": len(employers)},
+        "results": {
+            "api_harvest": bench_api_harvest(employers, args.latency, args.workers),
+            "pipeline_memory": bench_pipeline_memory(args.memory_scales, args.workers),
+            "salary_normalization": bench_salary_normalization(employers),
+        },
+    }
+
+    if not args.skip_db:
+        load_dotenv()
+        db_manager = DBManager(
+            os.getenv("BENCH_DB_NAME", "hh_bench"),
+            os.getenv("DB_HOST"),
+            os.getenv("DB_PORT"),
+            os.getenv("DB_USER"),
+            os.getenv("DB_PASSWORD"),
+        )
+        with db_manager:
+            report["results"]["db_ingest"] = bench_db_ingest(db_manager, employers)
+            report["results"]["queries"] = bench_queries(db_manager, args.repeats)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        FileManager().write_file(Path(args.output), output)
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import (
+    MAX_VACANCIES_PER_EMPLOYER,
+    generate_employer,
+    generate_vacancy,
+)
+
+
+class StubHhServer:
+    """Локальная заглушка эндпоинтов /employers/{id} и /vacancies hh.ru.
+
+    employers - словарь {ID компании: число вакансий}. Каждый ответ
+    задерживается на latency секунд, чтобы имитировать сетевую задержку.
+    Используется как контекстный менеджер; base_url доступен после входа.
+    """
+
+    def __init__(self, employers: Dict[str, int], latency: float = 0.0):
+        self.employers = employers
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/"
+
+    def __enter__(self) -> "StubHhServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict) -> None:
+                payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                stub._count()
+                if stub.latency:
+                    time.sleep(stub.latency)
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                parts = url.path.strip("/").split("/")
+                if len(parts) == 2 and parts[0] == "employers":
+                    if parts[1] in stub.employers:
+                        self._send_json(200, generate_employer(parts[1]))
+                    else:
+                        self._send_json(404, {"errors": [{"type": "not_found"}]})
+                elif parts == ["vacancies"]:
+                    self._send_json(200, stub._vacancies_page(params))
+                else:
+                    self._send_json(404, {"errors": [{"type": "not_found"}]})
+
+        return Handler
+
+    def _vacancies_page(self, params: Dict[str, str]) -> Dict:
+        """Строит страницу выдачи /vacancies для компании."""
+        employer_id = params.get("employer_id", "")
+        per_page = int(params.get("per_page", 20))
+        page = int(params.get("page", 0))
+        found = self.employers.get(employer_id, 0)
+        visible = min(found, MAX_VACANCIES_PER_EMPLOYER)
+        start, end = page * per_page, min((page + 1) * per_page, visible)
+        return {
+            "items": [generate_vacancy(employer_id, i) for i in range(start, end)],
+            "found": found,
+            "pages": -(-visible // per_page),
+            "page": page,
+            "per_page": per_page,
+        }
+
+
+class StubHhProcess:
+    """StubHhServer в отдельном процессе.
+
+    Генерация страниц заглушкой не отнимает GIL у клиента и не попадает
+    в tracemalloc его процесса. Число обслуженных запросов доступно
+    в requests после выхода из контекста.
+    """
+
+    def __init__(self, employers: Dict[str, int], latency: float = 0.0):
+        self.employers = employers
+        self.latency = latency
+        self.base_url = ""
+        self.requests = 0
+        self._process = None
+
+    def __enter__(self) -> "StubHhProcess":
+        self._process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.stub_server",
+                "--employers",
+                json.dumps(self.employers),
+                "--latency",
+                str(self.latency),
+            ],
+            cwd=Path(__file__).resolve().parent.parent,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.base_url = self._process.stdout.readline().strip()
+        if not self.base_url:
+            self._process.kill()
+            raise RuntimeError("Заглушка API hh.ru не запустилась.")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # Закрытый stdin - сигнал дочернему процессу завершиться,
+        # перед выходом он выводит число обслуженных запросов
+        try:
+            output, _ = self._process.communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.communicate()
+            return
+        if output.strip():
+            self.requests = int(output)
+
+
+def main():
+    """Запускает заглушку и выводит ее base_url; работает до закрытия stdin,
+    после чего выводит число обслуженных запросов.
+    """
+    parser = argparse.ArgumentParser(description="Заглушка API hh.ru.")
+    parser.add_argument(
+        "--employers", required=True, help="JSON {ID компании: число вакансий}."
+    )
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    with StubHhServer(json.loads(args.employers), args.latency) as stub:
+        print(stub.base_url, flush=True)
+        sys.stdin.read()
+    print(stub.requests, flush=True)
+
+
+if __name__ == "__main__":
+    main()
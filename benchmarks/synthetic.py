@@ -0,0 +1,83 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List
+
+# Лимит выдачи hh.ru на один поисковый запрос, см. src.api.MAX_SEARCH_DEPTH
+MAX_VACANCIES_PER_EMPLOYER = 2000
+
+POSITIONS = [
+    "Python-разработчик",
+    "Backend-разработчик",
+    "Frontend-разработчик",
+    "Аналитик данных",
+    "Системный администратор",
+    "Тестировщик",
+    "DevOps-инженер",
+    "Менеджер проектов",
+    "Продавец-консультант",
+    "Бухгалтер",
+]
+GRADES = ["Junior", "Middle", "Senior", "Lead", "Стажёр"]
+CITIES = ["Москва", "Санкт-Петербург", "Казань", "Новосибирск", "Екатеринбург"]
+CURRENCIES = ["RUR"] * 8 + ["USD", "EUR"]
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=3)))
+
+
+def split_vacancies(total: int, employers: int) -> List[int]:
+    """Распределяет total вакансий между компаниями поровну.
+    Число компаний увеличивается, если иначе у какой-то из них
+    окажется больше вакансий, чем отдает поиск hh.ru.
+    """
+    employers = max(employers, -(-total // MAX_VACANCIES_PER_EMPLOYER), 1)
+    base, extra = divmod(total, employers)
+    return [base + (1 if i < extra else 0) for i in range(employers)]
+
+
+def generate_employer(employer_id: str) -> Dict:
+    """Генерирует ответ /employers/{id}."""
+    rnd = random.Random(f"employer-{employer_id}")
+    return {
+        "id": employer_id,
+        "name": f"Компания {employer_id}",
+        "description": " ".join(rnd.choices(POSITIONS, k=rnd.randint(5, 40))),
+        "site_url": f"https://example.com/{employer_id}",
+        "area": {"name": rnd.choice(CITIES)},
+        "open_vacancies": 0,
+    }
+
+
+def generate_vacancy(employer_id: str, index: int) -> Dict:
+    """Генерирует вакансию компании с порядковым номером index.
+    Результат зависит только от аргументов, поэтому любую страницу
+    выдачи можно построить без хранения всех вакансий в памяти.
+    """
+    rnd = random.Random(f"vacancy-{employer_id}-{index}")
+    vacancy_id = f"{employer_id}{index:07d}"
+    salary = None
+    if rnd.random() < 0.7:
+        currency = rnd.choice(CURRENCIES)
+        low = rnd.randrange(30, 400) * (1000 if currency == "RUR" else 10)
+        salary = {
+            "from": low if rnd.random() < 0.8 else None,
+            "to": low + rnd.randrange(0, 200) * 1000 if rnd.random() < 0.6 else None,
+            "currency": currency,
+            "gross": rnd.random() < 0.5,
+        }
+        if salary["from"] is None and salary["to"] is None:
+            salary["from"] = low
+    published_at = EPOCH + timedelta(minutes=rnd.randrange(0, 365 * 24 * 60))
+    return {
+        "id": vacancy_id,
+        "name": f"{rnd.choice(GRADES)} {rnd.choice(POSITIONS)}",
+        "salary": salary,
+        "area": {"name": rnd.choice(CITIES)},
+        "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+        "published_at": published_at.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "employer": {"id": employer_id, "name": f"Компания {employer_id}"},
+    }
+
+
+def generate_vacancies(employer_id: str, count: int) -> Iterator[Dict]:
+    """Лениво генерирует count вакансий компании."""
+    for index in range(count):
+        yield generate_vacancy(employer_id, index)
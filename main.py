@@ -1,18 +1,25 @@
-from src.api import HhApiClient
-from src.db_manager import DBManager
-from dotenv import load_dotenv
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
 import os
 import argparse
 import logging
 
+# Подсистемы (requests, psycopg2, numpy, flask) импортируются внутри функций,
+# только когда они нужны выбранному действию
+if TYPE_CHECKING:
+    from src.api import HhApiClient
+    from src.db_manager import DBManager
+    from src.salary import CurrencyRates
+
 # Настраиваем логгер
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s [%(levelname)s]: %(message)s"
 )
 logger = logging.getLogger(__name__)
 
-# Загружаем переменные окружения из .env
-load_dotenv()
+DEFAULT_COMPANY_IDS = ["1740", "78638", "3529"]
+# Действия, которые можно выполнить через фоновый процесс --serve
+DAEMON_ACTIONS = ("load", "show", "clean")
 
 
 def main():
@@ -22,72 +29,452 @@ def main():
     )
     parser.add_argument(
         "--action",
-        choices=["load", "show", "clean"],
+        choices=["load", "show", "clean", "export", "import", "api"],
         help="Действие: load - загрузить данные, show - "
-        "показать статистику, clean - очистить базу данных.",
+        "показать статистику, clean - очистить базу данных, "
+        "export - выгрузить вакансии из API в снимок, "
+        "import - загрузить снимок в базу данных, "
+        "api - запустить HTTP-сервис чтения данных.",
+    )
+    parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="Файл снимка вакансий: .ndjson, .ndjson.gz, .ndjson.zst или .parquet.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Максимальное число одновременных запросов к API hh.ru.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Ограничение частоты запросов к API hh.ru (запросов в секунду).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Загружать только вакансии, опубликованные после прошлой синхронизации.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Каталог для кэширования ответов API hh.ru.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600,
+        help="Срок жизни записи кэша в секундах.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Работать только по кэшу ответов, без обращений к hh.ru.",
+    )
+    parser.add_argument(
+        "--employer-ids",
+        nargs="+",
+        default=None,
+        help="ID компаний hh.ru для загрузки.",
+    )
+    parser.add_argument(
+        "--employers-file",
+        default=None,
+        help="Файл с ID компаний hh.ru, по одному в строке.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Число компаний, загружаемых параллельно.",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Число повторных попыток загрузки компании при ошибке.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Файл контрольной точки для продолжения прерванной загрузки.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Файл для сохранения метрик в формате Prometheus по завершении.",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Порт HTTP-эндпоинта /metrics на время работы.",
+    )
+    parser.add_argument(
+        "--currency-rates",
+        default=None,
+        help="JSON-файл справочника hh.ru с курсами валют вместо запроса к API.",
+    )
+    parser.add_argument(
+        "--api-host",
+        default="127.0.0.1",
+        help="Адрес HTTP-сервиса чтения данных.",
+    )
+    parser.add_argument(
+        "--api-port",
+        type=int,
+        default=8000,
+        help="Порт HTTP-сервиса чтения данных.",
+    )
+    parser.add_argument(
+        "--api-cache-ttl",
+        type=float,
+        default=5,
+        help="Срок жизни результатов запросов в кэше HTTP-сервиса в секундах.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Запустить фоновый процесс, принимающий команды load, show и clean "
+        "через Unix-сокет --socket.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Unix-сокет фонового процесса. Без --serve действие "
+        "load, show или clean передается запущенному процессу.",
     )
     args = parser.parse_args()
+    if args.offline and not args.cache_dir:
+        parser.error("--offline требует указать --cache-dir.")
+    if args.action in ("export", "import") and not args.snapshot:
+        parser.error(f"--action {args.action} требует указать --snapshot.")
+    if args.serve and not args.socket:
+        parser.error("--serve требует указать --socket.")
+    if args.socket and not args.serve and args.action not in DAEMON_ACTIONS:
+        parser.error(
+            f"Через --socket доступны только действия: {', '.join(DAEMON_ACTIONS)}."
+        )
+
+    if args.socket and not args.serve:
+        run_remote(args)
+        return
+
+    from src.metrics import metrics
+
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    if args.serve:
+        serve(args)
+    else:
+        run_action(args)
 
-    # Читаем параметры из переменных окружения
-    db_name = os.getenv("DB_NAME")
-    db_host = os.getenv("DB_HOST")
-    db_port = os.getenv("DB_PORT")
-    db_user = os.getenv("DB_USER")
-    db_pass = os.getenv("DB_PASSWORD")
+    summary = metrics.summary()
+    if summary:
+        logger.info(f"Метрики выполнения:\n{summary}")
+    if args.metrics_file:
+        metrics.dump(Path(args.metrics_file))
 
-    # Создаем экземпляр менеджера базы данных
-    db_manager = DBManager(db_name, db_host, db_port, db_user, db_pass)
 
-    # Создаем клиент API hh.ru
-    api_client = HhApiClient()
+def make_db_manager() -> "DBManager":
+    """Создает менеджер базы данных по переменным окружения из .env."""
+    from dotenv import load_dotenv
+    from src.db_manager import DBManager
 
-    # Действия в зависимости от выбранного параметра
+    load_dotenv()
+    return DBManager(
+        os.getenv("DB_NAME"),
+        os.getenv("DB_HOST"),
+        os.getenv("DB_PORT"),
+        os.getenv("DB_USER"),
+        os.getenv("DB_PASSWORD"),
+    )
+
+
+def make_api_client(args: argparse.Namespace) -> "HhApiClient":
+    """Создает клиент API hh.ru с кэшем ответов, если он задан."""
+    from src.api import HhApiClient
+    from src.cache import ResponseCache
+
+    cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl) if args.cache_dir else None
+    return HhApiClient(
+        max_workers=args.workers,
+        rate_limit=args.rate_limit,
+        cache=cache,
+        offline=args.offline,
+    )
+
+
+def collect_employer_ids(
+    employer_ids: Optional[List[str]], employers_file: Optional[str]
+) -> List[str]:
+    """Собирает ID компаний из аргументов и файла."""
+    from src.loader import read_employer_ids
+
+    result = list(employer_ids or [])
+    if employers_file:
+        result.extend(read_employer_ids(employers_file))
+    return result
+
+
+def run_action(args: argparse.Namespace):
+    """Выполняет действие, создавая только нужные ему подсистемы."""
     if args.action == "load":
         logger.info("Начинаем загрузку данных...")
-        load_data(api_client, db_manager)
+        employer_ids = collect_employer_ids(args.employer_ids, args.employers_file)
+        with make_db_manager() as db_manager, make_api_client(args) as api_client:
+            load_data(
+                api_client,
+                db_manager,
+                employer_ids,
+                incremental=args.incremental,
+                jobs=args.jobs,
+                retries=args.retries,
+                checkpoint=args.checkpoint,
+                rates=load_currency_rates(api_client, args.currency_rates),
+            )
+        invalidate_read_cache()
     elif args.action == "show":
         logger.info("Получаем статистику...")
-        show_statistics(db_manager)
+        with make_db_manager() as db_manager:
+            show_statistics(db_manager)
     elif args.action == "clean":
         logger.info("Очищаем базу данных...")
-        clear_database(db_manager)
+        with make_db_manager() as db_manager:
+            clear_database(db_manager)
+        invalidate_read_cache()
+    elif args.action == "export":
+        from src.snapshot import export_snapshot
+
+        logger.info("Выгружаем вакансии в снимок...")
+        employer_ids = collect_employer_ids(args.employer_ids, args.employers_file)
+        with make_api_client(args) as api_client:
+            count = export_snapshot(
+                api_client, employer_ids or DEFAULT_COMPANY_IDS, Path(args.snapshot)
+            )
+        logger.info(f"В снимок {args.snapshot} записано вакансий: {count}.")
+    elif args.action == "import":
+        from src.snapshot import import_snapshot
+
+        logger.info("Загружаем снимок в базу данных...")
+        if args.currency_rates:
+            rates = load_currency_rates(None, args.currency_rates)
+        else:
+            with make_api_client(args) as api_client:
+                rates = load_currency_rates(api_client)
+        with make_db_manager() as db_manager:
+            db_manager.create_database()
+            db_manager.create_tables()
+            count = import_snapshot(db_manager, Path(args.snapshot), rates=rates)
+        logger.info(f"Из снимка {args.snapshot} загружено вакансий: {count}.")
+        invalidate_read_cache()
+    elif args.action == "api":
+        from src.web import create_app
+
+        logger.info(
+            f"Запускаем HTTP-сервис чтения на {args.api_host}:{args.api_port}..."
+        )
+        with make_db_manager() as db_manager:
+            app = create_app(db_manager, cache_ttl=args.api_cache_ttl)
+            app.run(host=args.api_host, port=args.api_port, threaded=True)
     else:
         logger.error("Не выбрано действие. Используйте аргумент '--help' для справки.")
 
 
-def load_data(api_client: HhApiClient, db_manager: DBManager):
-    """Загружает данные о компаниях и вакансиях в базу данных."""
-    # Список реальных ID компаний с hh.ru
-    company_ids = ["1740", "78638", "3529"]  # Добавьте сюда реальные ID компаний
+def serve(args: argparse.Namespace):
+    """Запускает фоновый процесс, выполняющий команды load, show и clean.
+    Пул соединений с базой, HTTP-сессия и кэш ответов API создаются один раз
+    и переиспользуются всеми командами до остановки процесса.
+    """
+    import signal
+    import threading
+    from src.daemon import CommandServer, DaemonError
+
+    db_manager = make_db_manager()
+    api_client = make_api_client(args)
+
+    def load(params: Dict) -> str:
+        employer_ids = collect_employer_ids(
+            params.get("employer_ids"), params.get("employers_file")
+        )
+        result = load_data(
+            api_client,
+            db_manager,
+            employer_ids,
+            incremental=params.get("incremental", args.incremental),
+            jobs=args.jobs,
+            retries=args.retries,
+            checkpoint=params.get("checkpoint") or args.checkpoint,
+            rates=load_currency_rates(api_client, args.currency_rates),
+        )
+        invalidate_read_cache()
+        return (
+            f"Загружено компаний: {len(result['loaded'])}, "
+            f"пропущено: {len(result['skipped'])}, "
+            f"с ошибками: {len(result['failed'])}."
+        )
+
+    def show(params: Dict) -> str:
+        return format_statistics(db_manager)
+
+    def clean(params: Dict) -> str:
+        clear_database(db_manager)
+        invalidate_read_cache()
+        return "База данных очищена."
+
+    try:
+        server = CommandServer(
+            Path(args.socket),
+            {"load": load, "show": show, "clean": clean},
+            exclusive=("load", "clean"),
+        )
+    except (OSError, DaemonError) as error:
+        logger.error(str(error))
+        raise SystemExit(1)
+    # serve_forever() нельзя остановить из того же потока
+    signal.signal(
+        signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start()
+    )
+    with db_manager, api_client, server:
+        logger.info(f"Фоновый процесс ожидает команды на {args.socket}.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    logger.info("Фоновый процесс остановлен.")
+
+
+def run_remote(args: argparse.Namespace):
+    """Передает действие фоновому процессу и выводит его ответ."""
+    from src.daemon import DaemonError, send_command
+
+    params = {}
+    if args.action == "load":
+        params = {
+            "employer_ids": args.employer_ids,
+            "employers_file": args.employers_file
+            and os.path.abspath(args.employers_file),
+            "incremental": args.incremental,
+            "checkpoint": args.checkpoint and os.path.abspath(args.checkpoint),
+        }
+    try:
+        print(send_command(Path(args.socket), args.action, params))
+    except (OSError, DaemonError) as error:
+        logger.error(f"Фоновый процесс не выполнил команду {args.action}: {error}")
+        raise SystemExit(1)
+
+
+def load_currency_rates(
+    api_client: Optional["HhApiClient"], filepath: Optional[str] = None
+) -> "CurrencyRates":
+    """Загружает курсы валют из файла или справочника hh.ru.
+    Если справочник недоступен, пересчитываются только рубли: для зарплат
+    в других валютах сохраняется только исходная вилка.
+    """
+    import requests
+    from src.salary import CurrencyRates
+
+    if filepath:
+        return CurrencyRates.from_file(Path(filepath))
+    if api_client is None:
+        return CurrencyRates()
+    try:
+        return CurrencyRates.from_api(api_client)
+    except requests.RequestException as error:
+        logger.warning(
+            f"Не удалось получить курсы валют: {error}. "
+            "Зарплаты в других валютах не будут пересчитаны в рубли."
+        )
+        return CurrencyRates()
+
+
+def load_data(
+    api_client: "HhApiClient",
+    db_manager: "DBManager",
+    employer_ids: Optional[List[str]] = None,
+    incremental: bool = False,
+    jobs: int = 4,
+    retries: int = 3,
+    checkpoint: Optional[str] = None,
+    rates: Optional["CurrencyRates"] = None,
+) -> Dict[str, List[str]]:
+    """Загружает данные о компаниях и вакансиях в базу данных.
+    Существующие записи обновляются по ID hh.ru, поэтому повторная загрузка
+    не создает дублей. В инкрементальном режиме для каждой компании
+    запрашиваются только вакансии, опубликованные после прошлой синхронизации.
+    Возвращает результат EmployerLoader.run.
+    """
+    from src.loader import EmployerLoader
+
+    # Список реальных ID компаний с hh.ru по умолчанию
+    company_ids = employer_ids or DEFAULT_COMPANY_IDS
 
     # Начинаем создавать базу данных и таблицы
     db_manager.create_database()
     db_manager.create_tables()
 
-    # Загружаем данные
-    for company_id in company_ids:
-        company_data = api_client.get_company(company_id)
-        if company_data:
-            company_id_in_db = db_manager.insert_company(company_data)
-            vacancies = api_client.get_vacancies_by_company(company_id)
-            for vacancy in vacancies:
-                db_manager.insert_vacancy(vacancy, company_id_in_db)
-        else:
-            logger.warning(
-                f"Не удалось получить данные о компании {company_id}. Пропускаем."
-            )
+    loader = EmployerLoader(
+        api_client,
+        db_manager,
+        workers=jobs,
+        retries=retries,
+        checkpoint_path=checkpoint,
+        incremental=incremental,
+        rates=rates,
+    )
+    result = loader.run(company_ids)
 
-    logger.info("Данные успешно загружены.")
+    if result["failed"]:
+        logger.warning(
+            f"Не удалось загрузить компании: {', '.join(result['failed'])}. "
+            "Повторный запуск продолжит загрузку с контрольной точки."
+        )
+    else:
+        logger.info("Данные успешно загружены.")
+    return result
 
 
-def show_statistics(db_manager: DBManager):
-    """Показывает статистику по данным в базе данных."""
+def format_statistics(db_manager: "DBManager") -> str:
+    """Формирует текст статистики по данным в базе данных."""
     statistics = db_manager.get_statistics()
-    print(f"Количество компаний: {statistics['num_companies']}")
-    print(f"Количество вакансий: {statistics['num_vacancies']}")
+    lines = [
+        f"Количество компаний: {statistics['num_companies']}",
+        f"Количество вакансий: {statistics['num_vacancies']}",
+    ]
+    avg_salary = db_manager.get_avg_salary()
+    if avg_salary is not None:
+        lines.append(f"Средняя зарплата: {avg_salary:.0f}")
+    return "\n".join(lines)
+
+
+def show_statistics(db_manager: "DBManager"):
+    """Показывает статистику по данным в базе данных."""
+    print(format_statistics(db_manager))
+
+
+def invalidate_read_cache():
+    """Сбрасывает кэш HTTP-сервиса чтения после изменения данных.
+    Адрес сервиса задается переменной окружения READ_API_URL.
+    """
+    api_url = os.getenv("READ_API_URL")
+    if not api_url:
+        return
+    import requests
+
+    try:
+        response = requests.post(
+            f"{api_url.rstrip('/')}/api/cache/invalidate", timeout=5
+        )
+        response.raise_for_status()
+    except requests.RequestException as error:
+        logger.warning(f"Не удалось сбросить кэш сервиса чтения: {error}")
 
 
-def clear_database(db_manager: DBManager):
+def clear_database(db_manager: "DBManager"):
     """Очищает базу данных."""
     db_manager.clear_database()
     logger.info("База данных очищена.")
@@ -1,39 +1,280 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Iterable, Iterator
+
 import requests
-from typing import Optional, List, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.cache import ResponseCache
+from src.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# hh.ru не отдаёт больше 2000 вакансий на один поисковый запрос
+MAX_SEARCH_DEPTH = 2000
+
+
+class HhApiError(requests.RequestException):
+    """API hh.ru не вернуло данные: ошибка сервера после всех повторов
+    или отсутствие ответа в кэше в автономном режиме.
+    """
+
+
+class OfflineCacheMiss(HhApiError):
+    """В автономном режиме ответа нет в кэше; повтор запроса не поможет."""
+
+
+class TokenBucket:
+    """Ограничитель частоты запросов по алгоритму token bucket.
+    Пополняется со скоростью rate токенов в секунду, но не более capacity.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Забирает один токен, при необходимости ожидая пополнения."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
 
 
 class HhApiClient:
     """Клиент для взаимодействия с публичным API hh.ru.
     Предоставляет методы для получения информации о компаниях
     и вакансиях с сайта hh.ru.
+
+    Все запросы идут через общую сессию с пулом keep-alive соединений.
+    Число одновременных запросов ограничено max_workers, частота - rate_limit
+    (запросов в секунду, None - без ограничения). Ответы 429 и 5xx
+    повторяются до retries раз с экспоненциальной паузой.
+
+    Если передан cache, ответы сохраняются на диск и перепроверяются
+    через If-None-Match/If-Modified-Since. В режиме offline запросы
+    в сеть не выполняются и все ответы берутся из кэша.
     """
 
-    def __init__(self):
-        self.base_url = "https://api.hh.ru/"
+    def __init__(
+        self,
+        base_url: str = "https://api.hh.ru/",
+        max_workers: int = 8,
+        rate_limit: Optional[float] = None,
+        timeout: float = 10,
+        per_page: int = 100,
+        cache: Optional[ResponseCache] = None,
+        offline: bool = False,
+        retries: int = 3,
+    ):
+        if offline and cache is None:
+            raise ValueError("Автономный режим требует кэша ответов.")
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.per_page = per_page
+        self.cache = cache
+        self.offline = offline
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = "coursework3/0.1.0"
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._bucket = TokenBucket(rate_limit) if rate_limit else None
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._page_executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hh-page"
+        )
 
-    def get_company(self, company_id: str) -> Optional[Dict]:
-        """Получает данные о компании по её ID."""
-        response = requests.get(f"{self.base_url}/employers/{company_id}")
+    def close(self) -> None:
+        """Останавливает пул потоков и закрывает соединения."""
+        self._page_executor.shutdown(wait=True)
+        self.session.close()
+
+    def __enter__(self) -> "HhApiClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _get(self, path: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Выполняет GET-запрос с учётом лимитов и возвращает JSON.
+        При наличии кэша свежие ответы берутся из него, а устаревшие
+        перепроверяются условным запросом. Возвращает None, если ресурс
+        не найден (404). В автономном режиме при отсутствии ответа в кэше
+        выбрасывает OfflineCacheMiss, при прочих ошибках - HhApiError.
+        """
+        url = f"{self.base_url}/{path}"
+        endpoint = {"endpoint": path.split("/", 1)[0]}
+        entry = self.cache.get(url, params) if self.cache is not None else None
+        if entry is not None and (self.offline or self.cache.is_fresh(entry)):
+            metrics.inc("hh_api_cache_total", {**endpoint, "result": "hit"})
+            return entry["body"]
+        if self.offline:
+            metrics.inc("hh_api_cache_total", {**endpoint, "result": "miss"})
+            raise OfflineCacheMiss(f"Ответа на запрос {path} нет в кэше.")
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        if self._bucket is not None:
+            self._bucket.acquire()
+        with self._slots, metrics.timer("hh_api_request_seconds", endpoint):
+            response = self.session.get(
+                url, params=params, headers=headers, timeout=self.timeout
+            )
+        metrics.inc(
+            "hh_api_requests_total", {**endpoint, "status": response.status_code}
+        )
+        metrics.inc("hh_api_response_bytes_total", endpoint, len(response.content))
+        retries = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            metrics.inc("hh_api_retries_total", endpoint, len(retries.history))
+
+        if response.status_code == 304 and entry is not None:
+            metrics.inc("hh_api_cache_total", {**endpoint, "result": "revalidated"})
+            self.cache.refresh(url, params, entry)
+            return entry["body"]
         if response.ok:
-            return response.json()
-        return None
+            body = response.json()
+            if self.cache is not None:
+                self.cache.set(
+                    url,
+                    params,
+                    body,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+            return body
+        if response.status_code == 404:
+            return None
+        raise HhApiError(
+            f"Ошибка запроса {path}: HTTP {response.status_code}", response=response
+        )
+
+    def get_company(self, company_id: str) -> Optional[Dict]:
+        """Получает данные о компании по её ID.
+        Возвращает None, если компания не найдена. В автономном режиме
+        при отсутствии ответа в кэше выбрасывает OfflineCacheMiss.
+        """
+        return self._get(f"employers/{company_id}")
+
+    def get_dictionaries(self) -> Dict:
+        """Получает справочники hh.ru, в том числе курсы валют.
+        Если справочники недоступны, выбрасывает HhApiError.
+        """
+        dictionaries = self._get("dictionaries")
+        if dictionaries is None:
+            raise HhApiError("Справочники hh.ru недоступны.")
+        return dictionaries
 
-    def get_vacancies_by_company(self, company_id: str) -> List[Dict]:
+    def _get_vacancies_page(
+        self, company_id: str, page: int, date_from: Optional[str] = None
+    ) -> Dict:
+        """Получает одну страницу вакансий компании.
+        Если страница недоступна, выбрасывает HhApiError: пропуск страницы
+        незаметно оборвал бы выборку.
+        """
+        params = {"employer_id": company_id, "per_page": self.per_page, "page": page}
+        if date_from:
+            params["date_from"] = date_from
+        data = self._get("vacancies", params=params)
+        if data is None:
+            raise HhApiError(
+                f"Не удалось получить страницу {page} вакансий компании {company_id}."
+            )
+        return data
+
+    def iter_vacancy_pages(
+        self, company_id: str, date_from: Optional[str] = None
+    ) -> Iterator[List[Dict]]:
+        """Постранично отдает вакансии компании по мере загрузки.
+        Первая страница запрашивается отдельно, чтобы узнать число страниц,
+        остальные загружаются параллельно, но не более чем на max_workers
+        страниц вперёд. date_from (ISO 8601) ограничивает выборку вакансиями,
+        опубликованными не раньше этой даты. Если какая-либо страница
+        недоступна, выбрасывается HhApiError. Если найдено больше
+        MAX_SEARCH_DEPTH вакансий, остаток недоступен через поиск
+        и об этом пишется предупреждение.
+        """
+        first = self._get_vacancies_page(company_id, 0, date_from)
+        found = first.get("found", 0)
+        if found > MAX_SEARCH_DEPTH:
+            lost = found - MAX_SEARCH_DEPTH
+            metrics.inc("hh_api_truncated_vacancies_total", value=lost)
+            logger.warning(
+                f"У компании {company_id} найдено вакансий: {found}, но поиск hh.ru "
+                f"отдает не больше {MAX_SEARCH_DEPTH}; {lost} вакансий не будут загружены."
+            )
+        yield first["items"]
+        pages = min(first.get("pages", 1), MAX_SEARCH_DEPTH // self.per_page)
+        pending = deque()
+        next_page = 1
+        try:
+            while pending or next_page < pages:
+                while next_page < pages and len(pending) < self.max_workers:
+                    pending.append(
+                        self._page_executor.submit(
+                            self._get_vacancies_page, company_id, next_page, date_from
+                        )
+                    )
+                    next_page += 1
+                yield pending.popleft().result()["items"]
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def get_vacancies_by_company(
+        self, company_id: str, date_from: Optional[str] = None
+    ) -> List[Dict]:
         """Получает список вакансий для определенной компании."""
         vacancies = []
-        page = 0
-        per_page = 100
-        while True:
-            response = requests.get(
-                f"{self.base_url}/vacancies",
-                params={"employer_id": company_id, "per_page": per_page, "page": page},
-            )
-            if response.ok:
-                data = response.json()
-                vacancies.extend(data["items"])
-                if len(data["items"]) < per_page:
-                    break
-                page += 1
-            else:
-                break
+        for items in self.iter_vacancy_pages(company_id, date_from):
+            vacancies.extend(items)
         return vacancies
+
+    def get_vacancies_by_companies(
+        self, company_ids: Iterable[str], date_from: Optional[Dict[str, str]] = None
+    ) -> Dict[str, List[Dict]]:
+        """Параллельно получает вакансии для нескольких компаний.
+        date_from задаёт для компаний отметку инкрементальной загрузки.
+        """
+        company_ids = list(company_ids)
+        date_from = date_from or {}
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="hh-employer"
+        ) as executor:
+            results = executor.map(
+                lambda company_id: self.get_vacancies_by_company(
+                    company_id, date_from.get(company_id)
+                ),
+                company_ids,
+            )
+            return dict(zip(company_ids, results))
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.file_manager import FileManager
+
+
+class ResponseCache:
+    """Постоянный кэш ответов API на диске.
+
+    Каждый ответ хранится в отдельном JSON-файле, имя которого - хэш URL
+    и параметров запроса. Вместе с телом сохраняются заголовки ETag и
+    Last-Modified для условных запросов. Записи моложе ttl секунд считаются
+    свежими. Когда суммарный размер файлов превышает max_size байт,
+    удаляются записи, к которым дольше всего не обращались.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl: float = 3600,
+        max_size: int = 100 * 1024 * 1024,
+        file_manager: Optional[FileManager] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.file_manager = file_manager or FileManager()
+        self._lock = threading.Lock()
+        # ключ -> (размер файла, время последнего обращения)
+        self._index: Dict[str, tuple] = {}
+        for path in self.directory.glob("*.json"):
+            stat = path.stat()
+            self._index[path.stem] = (stat.st_size, stat.st_mtime)
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """Строит ключ записи по URL и параметрам запроса."""
+        normalized = sorted((str(k), str(v)) for k, v in (params or {}).items())
+        raw = json.dumps([url, normalized], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+        """Возвращает запись кэша или None, если её нет.
+        Файл читается без блокировки, чтобы параллельные запросы
+        не ждали друг друга: запись заменяется атомарно в set().
+        """
+        key = self.make_key(url, params)
+        with self._lock:
+            if key not in self._index:
+                return None
+        path = self._path(key)
+        try:
+            entry = self.file_manager.load_json(path)
+        except FileNotFoundError:
+            # Запись вытеснена другим потоком
+            return None
+        except (OSError, ValueError):
+            with self._lock:
+                self._index.pop(key, None)
+            return None
+        now = time.time()
+        with self._lock:
+            if key in self._index:
+                self._index[key] = (self._index[key][0], now)
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        return entry
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Проверяет, не истек ли срок жизни записи."""
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def set(
+        self,
+        url: str,
+        params: Optional[Dict],
+        body: Dict,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Сохраняет ответ в кэш и при необходимости вытесняет старые записи."""
+        key = self.make_key(url, params)
+        entry = {
+            "url": url,
+            "params": params,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+        }
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        self.file_manager.dump_json(tmp_path, entry, compact=True)
+        with self._lock:
+            os.replace(tmp_path, path)
+            self._index[key] = (path.stat().st_size, time.time())
+            self._evict()
+
+    def refresh(self, url: str, params: Optional[Dict], entry: Dict) -> None:
+        """Продлевает срок жизни записи после ответа 304 Not Modified."""
+        self.set(url, params, entry["body"], entry["etag"], entry["last_modified"])
+
+    def _evict(self) -> None:
+        """Удаляет самые давно использованные записи сверх max_size."""
+        total = sum(size for size, _ in self._index.values())
+        if total <= self.max_size:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if total <= self.max_size:
+                break
+            self._path(key).unlink(missing_ok=True)
+            del self._index[key]
+            total -= size
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        with self._lock:
+            for key in self._index:
+                self._path(key).unlink(missing_ok=True)
+            self._index.clear()
+
+
+class QueryCache:
+    """Кэш результатов запросов в памяти с ограничением по времени и размеру.
+
+    Запись живет ttl секунд; при превышении max_entries вытесняется
+    запись, к которой дольше всего не обращались. clear() сбрасывает
+    кэш целиком, например после загрузки новых данных.
+    """
+
+    def __init__(self, ttl: float = 5, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Растет при каждой очистке, чтобы не сохранить результат,
+        # вычисленный по данным до очистки
+        self._generation = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Возвращает значение из кэша или вычисляет и сохраняет его."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+            generation = self._generation
+        value = compute()
+        with self._lock:
+            if generation != self._generation:
+                return value
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Обработчик команды: принимает параметры, возвращает текст ответа
+Handler = Callable[[Dict], str]
+
+
+class DaemonError(Exception):
+    """Ошибка выполнения команды в фоновом процессе."""
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """Обрабатывает одну команду: строку JSON {"action": ..., "params": {...}}.
+    Ответ - строка JSON {"ok": true, "output": ...} или {"ok": false, "error": ...}.
+    """
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = {"ok": True, "output": self.server.dispatch(request)}
+        except Exception as error:
+            logger.exception("Ошибка выполнения команды")
+            response = {"ok": False, "error": str(error)}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+        self.wfile.write(b"\n")
+
+
+class CommandServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Фоновый процесс, принимающий команды через локальный Unix-сокет.
+
+    Процесс держит открытыми пул соединений с базой, HTTP-сессию и кэши,
+    поэтому повторные команды не тратят время на запуск интерпретатора,
+    импорт модулей и установку соединений. Команды из exclusive
+    выполняются по одной, остальные - параллельно с ними.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        handlers: Dict[str, Handler],
+        exclusive: tuple = (),
+    ):
+        self.socket_path = Path(socket_path)
+        self.handlers = handlers
+        self.exclusive = set(exclusive)
+        self._exclusive_lock = threading.Lock()
+        self._remove_stale_socket()
+        super().__init__(str(self.socket_path), _CommandHandler)
+
+    def server_bind(self):
+        # Команды принимаются только от владельца процесса: сокет создается
+        # сразу с правами 0600, без промежутка до chmod
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def _remove_stale_socket(self) -> None:
+        """Удаляет сокет, оставшийся от завершившегося процесса.
+        Другие файлы и каталоги по этому пути не трогаются.
+        """
+        try:
+            mode = self.socket_path.lstat().st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise DaemonError(f"Путь {self.socket_path} занят и не является сокетом.")
+        try:
+            send_command(self.socket_path, "ping", timeout=5)
+        except ConnectionRefusedError:
+            # Сокет никто не слушает
+            self.socket_path.unlink()
+        else:
+            raise DaemonError(f"Фоновый процесс уже запущен: {self.socket_path}")
+
+    def dispatch(self, request: Dict) -> str:
+        """Выполняет команду и возвращает текст ответа."""
+        action = request.get("action")
+        if action == "ping":
+            return "pong"
+        if action not in self.handlers:
+            raise DaemonError(f"Неизвестная команда: {action}")
+        params = request.get("params") or {}
+        logger.info(f"Выполняем команду {action}...")
+        if action in self.exclusive:
+            with self._exclusive_lock:
+                return self.handlers[action](params)
+        return self.handlers[action](params)
+
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def send_command(
+    socket_path: Path,
+    action: str,
+    params: Optional[Dict] = None,
+    timeout: Optional[float] = None,
+) -> str:
+    """Отправляет команду фоновому процессу и возвращает текст ответа.
+    Если команда завершилась ошибкой, выбрасывает DaemonError.
+    """
+    request = json.dumps({"action": action, "params": params or {}})
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(request.encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise DaemonError("Фоновый процесс закрыл соединение без ответа.")
+    response = json.loads(line)
+    if not response["ok"]:
+        raise DaemonError(response["error"])
+    return response["output"]
@@ -1,14 +1,98 @@
+import logging
+import threading
+import time
+from datetime import datetime
 import psycopg2
-from contextlib import closing
-from typing import Dict
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from contextlib import closing, contextmanager
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+from psycopg2.extensions import (
+    ISOLATION_LEVEL_AUTOCOMMIT,
+    TRANSACTION_STATUS_UNKNOWN,
+    connection as Connection,
+)
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
+
+from src.metrics import instrumented, metrics
+
+if TYPE_CHECKING:
+    # Нормализация зарплат тянет numpy; для чтения статистики он не нужен
+    from src.salary import CurrencyRates
+
+
+logger = logging.getLogger(__name__)
+
+UPSERT_COMPANIES = """
+    INSERT INTO companies (hh_id, name, description) VALUES %s
+    ON CONFLICT (hh_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        description = COALESCE(EXCLUDED.description, companies.description)
+    RETURNING id
+"""
+
+UPSERT_VACANCIES = """
+    INSERT INTO vacancies (
+        hh_id, title, salary, salary_from, salary_to, salary_currency,
+        salary_gross, link, published_at, company_id
+    )
+    VALUES %s
+    ON CONFLICT (hh_id) DO UPDATE SET
+        title = EXCLUDED.title,
+        salary = EXCLUDED.salary,
+        salary_from = EXCLUDED.salary_from,
+        salary_to = EXCLUDED.salary_to,
+        salary_currency = EXCLUDED.salary_currency,
+        salary_gross = EXCLUDED.salary_gross,
+        link = EXCLUDED.link,
+        published_at = EXCLUDED.published_at,
+        company_id = EXCLUDED.company_id,
+        updated_at = now()
+"""
+
+
+def _dedupe(rows: List[Tuple]) -> Tuple[List, Dict]:
+    """Убирает из пачки повторы по ID hh.ru (первый элемент строки),
+    оставляя последнюю версию: ON CONFLICT не может обновить одну строку
+    дважды за запрос. Возвращает ключи исходных строк и словарь уникальных.
+    """
+    keys = [
+        row[0] if row[0] is not None else ("row", position)
+        for position, row in enumerate(rows)
+    ]
+    unique = {}
+    for key, row in zip(keys, rows):
+        unique.pop(key, None)
+        unique[key] = row
+    return keys, unique
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Разбивает итерируемый объект на списки длиной не более size."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 
 class DBManager:
-    """Класс для работы с базой данных PostgreSQL."""
+    """Класс для работы с базой данных PostgreSQL.
+
+    Соединения берутся из потокобезопасного пула размером от min_conn
+    до max_conn. Если свободных соединений нет, поток ждёт освобождения.
+    Соединение, простоявшее дольше health_check_interval секунд,
+    перед выдачей проверяется запросом SELECT 1.
+    """
 
     def __init__(
-        self, db_name: str, db_host: str, db_port: str, db_user: str, db_pass: str
+        self,
+        db_name: str,
+        db_host: str,
+        db_port: str,
+        db_user: str,
+        db_pass: str,
+        min_conn: int = 1,
+        max_conn: int = 10,
+        health_check_interval: float = 30,
     ):
         self.conn_params = {
             "dbname": db_name,
@@ -17,7 +101,77 @@ class DBManager:
             "host": db_host,
             "port": db_port,
         }
+        self.min_conn = min_conn
+        self.max_conn = max_conn
+        self.health_check_interval = health_check_interval
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_conn)
+        self._last_used: Dict[int, float] = {}
+
+    def __enter__(self) -> "DBManager":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Закрывает все соединения пула."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+                self._last_used.clear()
+
+    def _get_pool(self) -> ThreadedConnectionPool:
+        """Создает пул соединений при первом обращении."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadedConnectionPool(
+                    self.min_conn, self.max_conn, **self.conn_params
+                )
+            return self._pool
+
+    def _is_alive(self, conn: Connection) -> bool:
+        """Проверяет, что соединение из пула пригодно к работе."""
+        if conn.closed or conn.info.transaction_status == TRANSACTION_STATUS_UNKNOWN:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """Выдает соединение из пула и возвращает его после использования.
+        При успешном выходе транзакция фиксируется, при ошибке - откатывается.
+        """
+        with self._slots:
+            with metrics.timer("db_checkout_seconds"):
+                pool = self._get_pool()
+                conn = pool.getconn()
+                while not self._is_alive(conn):
+                    self._last_used.pop(id(conn), None)
+                    pool.putconn(conn, close=True)
+                    conn = pool.getconn()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                self._last_used[id(conn)] = time.monotonic()
+                pool.putconn(conn, close=bool(conn.closed))
 
+    @instrumented
     def create_database(self) -> None:
         """Создает базу данных PostgreSQL, если она не существует."""
         temp_conn_params = self.conn_params.copy()
@@ -25,11 +179,19 @@ class DBManager:
         with closing(psycopg2.connect(**temp_conn_params)) as conn:
             conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
             with conn.cursor() as cur:
-                cur.execute(f"CREATE DATABASE {self.conn_params['dbname']};")
+                cur.execute(
+                    "SELECT 1 FROM pg_database WHERE datname = %s;",
+                    (self.conn_params["dbname"],),
+                )
+                if cur.fetchone() is None:
+                    cur.execute(f"CREATE DATABASE {self.conn_params['dbname']};")
 
+    @instrumented
     def create_tables(self) -> None:
-        """Создает таблицы для хранения данных о компаниях и вакансиях."""
-        with closing(psycopg2.connect(**self.conn_params)) as conn:
+        """Создает таблицы для хранения данных о компаниях и вакансиях.
+        Таблицы, созданные прежними версиями, дополняются недостающими колонками.
+        """
+        with self.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -51,51 +213,297 @@ class DBManager:
                     );
                 """
                 )
-            conn.commit()
-
-    def insert_company(self, company_data: Dict) -> int:
-        """Вставляет запись о компании в базу данных."""
-        with closing(psycopg2.connect(**self.conn_params)) as conn:
-            with conn.cursor() as cur:
                 cur.execute(
                     """
-                    INSERT INTO companies (name, description) VALUES (%s, %s) RETURNING id;
-                    """,
-                    (company_data["name"], company_data.get("description")),
+                    ALTER TABLE companies
+                        ADD COLUMN IF NOT EXISTS hh_id VARCHAR(32);
+                    CREATE UNIQUE INDEX IF NOT EXISTS companies_hh_id_key
+                        ON companies (hh_id);
+                    ALTER TABLE vacancies
+                        ADD COLUMN IF NOT EXISTS hh_id VARCHAR(32),
+                        ADD COLUMN IF NOT EXISTS published_at TIMESTAMPTZ,
+                        ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT now(),
+                        ADD COLUMN IF NOT EXISTS salary_from INTEGER,
+                        ADD COLUMN IF NOT EXISTS salary_to INTEGER,
+                        ADD COLUMN IF NOT EXISTS salary_currency VARCHAR(3),
+                        ADD COLUMN IF NOT EXISTS salary_gross BOOLEAN;
+                    CREATE UNIQUE INDEX IF NOT EXISTS vacancies_hh_id_key
+                        ON vacancies (hh_id);
+                """
+                )
+                cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS sync_state (
+                        employer_id VARCHAR(32) PRIMARY KEY,
+                        last_published_at TIMESTAMPTZ,
+                        synced_at TIMESTAMPTZ DEFAULT now()
+                    );
+                """
+                )
+                cur.execute(
+                    """
+                    CREATE INDEX IF NOT EXISTS vacancies_company_id_idx
+                        ON vacancies (company_id);
+                    CREATE INDEX IF NOT EXISTS vacancies_salary_idx
+                        ON vacancies (salary);
+                """
                 )
-                return cur.fetchone()[0]
+                # Триграммный индекс ускоряет поиск по подстроке в названии.
+                # Расширение может быть недоступно без прав суперпользователя,
+                # тогда поиск работает без индекса.
+                cur.execute("SAVEPOINT trigram;")
+                try:
+                    cur.execute(
+                        """
+                        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                        CREATE INDEX IF NOT EXISTS vacancies_title_trgm_idx
+                            ON vacancies USING gin (title gin_trgm_ops);
+                    """
+                    )
+                except psycopg2.Error as error:
+                    cur.execute("ROLLBACK TO SAVEPOINT trigram;")
+                    logger.warning(f"Триграммный индекс не создан: {error}")
+
+    @staticmethod
+    def _company_row(company_data: Dict) -> Tuple:
+        """Преобразует компанию из ответа API в строку таблицы companies."""
+        return (
+            company_data.get("id"),
+            company_data["name"],
+            company_data.get("description"),
+        )
+
+    def insert_company(self, company_data: Dict) -> int:
+        """Вставляет или обновляет запись о компании по её ID на hh.ru."""
+        return self.insert_companies_bulk([company_data])[0]
+
+    @instrumented
+    def insert_companies_bulk(
+        self, companies: Iterable[Dict], batch_size: int = 1000
+    ) -> List[int]:
+        """Вставляет или обновляет записи о компаниях пачками в одной транзакции.
+        Возвращает id записей в порядке входных данных.
+        """
+        ids = []
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                for chunk in _chunked(companies, batch_size):
+                    keys, rows = _dedupe([self._company_row(c) for c in chunk])
+                    returned = execute_values(
+                        cur,
+                        f"{UPSERT_COMPANIES};",
+                        list(rows.values()),
+                        page_size=batch_size,
+                        fetch=True,
+                    )
+                    id_by_key = {
+                        key: row[0] for key, row in zip(rows.keys(), returned)
+                    }
+                    ids.extend(id_by_key[key] for key in keys)
+                    metrics.inc(
+                        "db_rows_total", {"method": "insert_companies_bulk"}, len(returned)
+                    )
+        return ids
+
+    @staticmethod
+    def _vacancy_row(vacancy: Dict, company_id: int) -> Tuple:
+        """Преобразует нормализованную вакансию в строку таблицы vacancies."""
+        return (
+            vacancy["hh_id"],
+            vacancy["title"],
+            vacancy["salary"],
+            vacancy["salary_from"],
+            vacancy["salary_to"],
+            vacancy["salary_currency"],
+            vacancy["salary_gross"],
+            vacancy["link"],
+            vacancy["published_at"],
+            company_id,
+        )
 
     def insert_vacancy(self, vacancy_data: Dict, company_id: int) -> None:
-        """Вставляет запись о вакансии в базу данных."""
-        title = vacancy_data.get("name") or ""
-        salary = vacancy_data.get("salary", {}).get("from") or None
-        link = vacancy_data.get("alternate_url") or ""
+        """Вставляет или обновляет запись о вакансии по её ID на hh.ru."""
+        self.insert_vacancies_bulk([vacancy_data], company_id)
+
+    def insert_vacancies_bulk(
+        self,
+        vacancies: Iterable[Dict],
+        company_id: int,
+        batch_size: int = 1000,
+        rates: Optional["CurrencyRates"] = None,
+    ) -> int:
+        """Вставляет или обновляет вакансии компании из ответа API пачками
+        по batch_size строк в одной транзакции. Зарплата пересчитывается
+        в рубли "на руки" по курсам rates. Возвращает число обработанных записей.
+        """
+        from src.salary import normalize_vacancies
+
+        rows = (
+            row
+            for chunk in _chunked(vacancies, batch_size)
+            for row in normalize_vacancies(chunk, rates)
+        )
+        return self.insert_vacancy_rows(rows, company_id, batch_size)
+
+    @instrumented
+    def insert_vacancy_rows(
+        self, rows: Iterable[Dict], company_id: int, batch_size: int = 1000
+    ) -> int:
+        """Вставляет или обновляет нормализованные вакансии
+        (см. salary.normalize_vacancies) пачками в одной транзакции.
+        Возвращает число обработанных записей.
+        """
+        count = 0
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                for chunk in _chunked(rows, batch_size):
+                    _, unique = _dedupe([self._vacancy_row(v, company_id) for v in chunk])
+                    execute_values(
+                        cur,
+                        f"{UPSERT_VACANCIES};",
+                        list(unique.values()),
+                        page_size=batch_size,
+                    )
+                    count += len(unique)
+                    metrics.inc(
+                        "db_rows_total", {"method": "insert_vacancy_rows"}, cur.rowcount
+                    )
+        return count
+
+    @instrumented
+    def get_sync_state(self, employer_id: str) -> Optional[datetime]:
+        """Возвращает дату публикации самой свежей загруженной вакансии
+        компании или None, если компания ещё не синхронизировалась.
+        """
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT last_published_at FROM sync_state WHERE employer_id = %s;",
+                    (employer_id,),
+                )
+                row = cur.fetchone()
+        return row[0] if row else None
 
-        with closing(psycopg2.connect(**self.conn_params)) as conn:
+    @instrumented
+    def update_sync_state(self, employer_id: str) -> None:
+        """Запоминает дату публикации самой свежей вакансии компании в базе
+        как отметку для следующей инкрементальной синхронизации.
+        """
+        with self.connection() as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
-                    INSERT INTO vacancies (title, salary, link, company_id) 
-                    VALUES (%s, %s, %s, %s);
+                    INSERT INTO sync_state (employer_id, last_published_at, synced_at)
+                    SELECT %s, MAX(v.published_at), now()
+                    FROM vacancies v JOIN companies c ON c.id = v.company_id
+                    WHERE c.hh_id = %s
+                    ON CONFLICT (employer_id) DO UPDATE SET
+                        last_published_at = EXCLUDED.last_published_at,
+                        synced_at = EXCLUDED.synced_at;
                     """,
-                    (title, salary, link, company_id),
+                    (employer_id, employer_id),
                 )
-            conn.commit()
 
+    @instrumented
     def clear_database(self) -> None:
         """Очищает таблицы в базе данных."""
-        with closing(psycopg2.connect(**self.conn_params)) as conn:
+        with self.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("DELETE FROM vacancies;")
-                cur.execute("DELETE FROM companies;")
-            conn.commit()
+                for table in ("vacancies", "companies", "sync_state"):
+                    cur.execute(f"DELETE FROM {table};")
+                    metrics.inc(
+                        "db_rows_total", {"method": "clear_database"}, cur.rowcount
+                    )
 
+    @instrumented
     def get_statistics(self) -> Dict:
         """Возвращает статистику по количеству записей."""
-        with closing(psycopg2.connect(**self.conn_params)) as conn:
+        with self.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute("SELECT COUNT(*) FROM companies;")
-                num_companies = cur.fetchone()[0]
-                cur.execute("SELECT COUNT(*) FROM vacancies;")
-                num_vacancies = cur.fetchone()[0]
+                cur.execute(
+                    "SELECT (SELECT COUNT(*) FROM companies), (SELECT COUNT(*) FROM vacancies);"
+                )
+                num_companies, num_vacancies = cur.fetchone()
         return {"num_companies": num_companies, "num_vacancies": num_vacancies}
+
+    @staticmethod
+    def _keyset(column: str, after_id: Optional[int], limit: Optional[int]) -> str:
+        """Строит окончание запроса для постраничной выборки по ключу:
+        следующая страница начинается после id последней записи предыдущей.
+        Использует именованные параметры after_id и limit.
+        """
+        where = f"AND {column} > %(after_id)s" if after_id is not None else ""
+        tail = "LIMIT %(limit)s" if limit is not None else ""
+        return f"{where} ORDER BY {column} {tail}"
+
+    def _fetch_dicts(self, query: str, params: Dict) -> List[Dict]:
+        """Выполняет запрос и возвращает строки в виде словарей."""
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, params)
+                return [dict(row) for row in cur.fetchall()]
+
+    @instrumented
+    def get_companies_and_vacancies_count(
+        self, limit: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Возвращает список компаний с количеством вакансий у каждой.
+        Вакансии считаются только для компаний текущей страницы
+        по индексу vacancies_company_id_idx.
+        """
+        return self._fetch_dicts(
+            f"""
+            SELECT c.id, c.name,
+                (SELECT COUNT(*) FROM vacancies v WHERE v.company_id = c.id)
+                    AS vacancies_count
+            FROM companies c
+            WHERE TRUE {self._keyset("c.id", after_id, limit)};
+            """,
+            {"after_id": after_id, "limit": limit},
+        )
+
+    @instrumented
+    def get_avg_salary(self) -> Optional[float]:
+        """Возвращает среднюю зарплату по вакансиям с указанной зарплатой."""
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT AVG(salary) FROM vacancies;")
+                avg_salary = cur.fetchone()[0]
+        return float(avg_salary) if avg_salary is not None else None
+
+    def _get_vacancies(
+        self,
+        condition: str,
+        params: Dict,
+        limit: Optional[int],
+        after_id: Optional[int],
+    ) -> List[Dict]:
+        """Возвращает вакансии с названием компании, отобранные по условию."""
+        return self._fetch_dicts(
+            f"""
+            SELECT v.id, v.title, v.salary, v.link, c.name AS company_name
+            FROM vacancies v
+            JOIN companies c ON c.id = v.company_id
+            WHERE {condition} {self._keyset("v.id", after_id, limit)};
+            """,
+            {**params, "after_id": after_id, "limit": limit},
+        )
+
+    @instrumented
+    def get_vacancies_with_higher_salary(
+        self, limit: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Возвращает вакансии с зарплатой выше средней."""
+        return self._get_vacancies(
+            "v.salary > (SELECT AVG(salary) FROM vacancies)", {}, limit, after_id
+        )
+
+    @instrumented
+    def get_vacancies_with_keyword(
+        self, keyword: str, limit: Optional[int] = None, after_id: Optional[int] = None
+    ) -> List[Dict]:
+        """Возвращает вакансии, в названии которых есть keyword (без учета регистра)."""
+        pattern = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return self._get_vacancies(
+            "v.title ILIKE %(pattern)s", {"pattern": f"%{pattern}%"}, limit, after_id
+        )
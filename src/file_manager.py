@@ -1,4 +1,6 @@
 from pathlib import Path
+from typing import IO, Iterable, Iterator
+import gzip
 import json
 
 
@@ -20,7 +22,45 @@ class FileManager:
         with open(filepath, mode="r", encoding="utf-8") as f:
             return json.load(f)
 
-    def dump_json(self, filepath: Path, obj: dict) -> None:
-        """Сохраняет словарь в JSON-файл."""
+    def dump_json(self, filepath: Path, obj: dict, compact: bool = False) -> None:
+        """Сохраняет словарь в JSON-файл.
+        compact - без отступов и пробелов, для служебных файлов.
+        """
         with open(filepath, mode="w", encoding="utf-8") as f:
-            json.dump(obj, f, ensure_ascii=False, indent=2)
+            if compact:
+                json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+            else:
+                json.dump(obj, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _open_text(filepath: Path, mode: str) -> IO[str]:
+        """Открывает текстовый файл со сжатием по расширению: .gz или .zst."""
+        suffix = Path(filepath).suffix
+        if suffix == ".gz":
+            return gzip.open(filepath, mode=f"{mode}t", encoding="utf-8")
+        if suffix == ".zst":
+            try:
+                import zstandard
+            except ImportError as error:
+                raise ImportError(
+                    "Для файлов .zst установите пакет zstandard."
+                ) from error
+            return zstandard.open(filepath, mode=f"{mode}t", encoding="utf-8")
+        return open(filepath, mode=mode, encoding="utf-8")
+
+    def dump_ndjson(self, filepath: Path, items: Iterable[dict]) -> int:
+        """Построчно сохраняет словари в NDJSON-файл. Возвращает число строк."""
+        count = 0
+        with self._open_text(filepath, "w") as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+                count += 1
+        return count
+
+    def iter_ndjson(self, filepath: Path) -> Iterator[dict]:
+        """Построчно читает NDJSON-файл, не загружая его целиком."""
+        with self._open_text(filepath, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
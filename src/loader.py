@@ -0,0 +1,199 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.api import HhApiClient, OfflineCacheMiss
+from src.db_manager import DBManager
+from src.file_manager import FileManager
+from src.pipeline import VacancyPipeline
+from src.salary import CurrencyRates
+
+logger = logging.getLogger(__name__)
+
+
+class EmployerLoadError(Exception):
+    """Не удалось загрузить данные компании."""
+
+
+class EmployerNotFoundError(EmployerLoadError):
+    """Компания не найдена на hh.ru; повторные попытки не помогут."""
+
+
+def read_employer_ids(filepath: Path) -> List[str]:
+    """Читает ID компаний из файла: по одному в строке, # - комментарий."""
+    ids = []
+    for line in FileManager().read_file(filepath).splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            ids.append(line)
+    return ids
+
+
+class EmployerLoader:
+    """Параллельная загрузка компаний и их вакансий пулом потоков.
+
+    Каждая компания обрабатывается одним рабочим потоком. При ошибке
+    загрузка повторяется до retries раз с экспоненциально растущей
+    паузой backoff * 2**n; ненайденная компания сразу считается
+    не загруженной. Успешно загруженные и ненайденные компании
+    записываются в файл checkpoint_path вместе со списком компаний
+    запуска и пропускаются при повторном запуске с тем же списком.
+    Когда повторять больше нечего, файл контрольной точки удаляется.
+    """
+
+    def __init__(
+        self,
+        api_client: HhApiClient,
+        db_manager: DBManager,
+        workers: int = 4,
+        retries: int = 3,
+        backoff: float = 1.0,
+        checkpoint_path: Optional[Path] = None,
+        incremental: bool = False,
+        rates: Optional[CurrencyRates] = None,
+    ):
+        self.api_client = api_client
+        self.db_manager = db_manager
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.incremental = incremental
+        self.pipeline = VacancyPipeline(api_client, db_manager, rates=rates)
+        self.file_manager = FileManager()
+        self._lock = threading.Lock()
+        self._employers: List[str] = []
+        self._done: Set[str] = set()
+        self._not_found: Set[str] = set()
+        self._per_worker: Dict[str, int] = {}
+        self._total = 0
+
+    def _load_checkpoint(self) -> None:
+        """Читает из файла контрольной точки ID загруженных и ненайденных
+        компаний. Контрольная точка другого списка компаний не используется.
+        """
+        self._done, self._not_found = set(), set()
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return
+        checkpoint = self.file_manager.load_json(self.checkpoint_path)
+        if checkpoint.get("employers") != self._employers:
+            logger.info(
+                f"Контрольная точка {self.checkpoint_path} относится к другому "
+                "списку компаний, загрузка начинается заново."
+            )
+            return
+        self._done = set(checkpoint["done"])
+        self._not_found = set(checkpoint.get("not_found", []))
+
+    def _save_checkpoint(self) -> None:
+        """Атомарно перезаписывает файл контрольной точки."""
+        if self.checkpoint_path is None:
+            return
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        self.file_manager.dump_json(
+            tmp_path,
+            {
+                "employers": self._employers,
+                "done": sorted(self._done),
+                "not_found": sorted(self._not_found),
+            },
+        )
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _load_employer(self, company_id: str) -> int:
+        """Загружает компанию и ее вакансии. Возвращает число вакансий."""
+        company_data = self.api_client.get_company(company_id)
+        if not company_data:
+            raise EmployerNotFoundError(f"Компания {company_id} не найдена.")
+        company_id_in_db = self.db_manager.insert_company(company_data)
+        date_from = None
+        if self.incremental:
+            last_published_at = self.db_manager.get_sync_state(company_id)
+            if last_published_at is not None:
+                date_from = last_published_at.isoformat()
+        count = self.pipeline.run(company_id, company_id_in_db, date_from)
+        # Отметка сдвигается только после того, как получены все страницы:
+        # иначе вакансии с пропущенных страниц старше отметки больше
+        # не запрашивались бы. При ошибке pipeline.run выбрасывает исключение.
+        self.db_manager.update_sync_state(company_id)
+        return count
+
+    def _process(self, company_id: str) -> bool:
+        """Загружает компанию с повторными попытками и отмечает прогресс."""
+        worker = threading.current_thread().name
+        for attempt in range(self.retries + 1):
+            try:
+                count = self._load_employer(company_id)
+                break
+            except EmployerNotFoundError as error:
+                logger.error(f"[{worker}] {error}")
+                # Повторный запуск не поможет: компания считается обработанной
+                with self._lock:
+                    self._not_found.add(company_id)
+                    self._save_checkpoint()
+                return False
+            except OfflineCacheMiss as error:
+                # Кэш не изменится до следующего запуска с доступом к сети
+                logger.error(f"[{worker}] Компания {company_id} не загружена: {error}")
+                return False
+            except Exception as error:
+                if attempt == self.retries:
+                    logger.error(
+                        f"[{worker}] Компания {company_id} не загружена "
+                        f"после {attempt + 1} попыток: {error}"
+                    )
+                    return False
+                delay = self.backoff * 2**attempt
+                logger.warning(
+                    f"[{worker}] Ошибка загрузки компании {company_id}: {error}. "
+                    f"Повтор через {delay:.1f} с."
+                )
+                time.sleep(delay)
+
+        with self._lock:
+            self._done.add(company_id)
+            self._per_worker[worker] = self._per_worker.get(worker, 0) + 1
+            self._save_checkpoint()
+            logger.info(
+                f"[{worker}] Компания {company_id}: вакансий {count}. "
+                f"Поток: {self._per_worker[worker]}, "
+                f"всего: {len(self._done)}/{self._total}."
+            )
+        return True
+
+    def run(self, employer_ids: Iterable[str]) -> Dict[str, List[str]]:
+        """Загружает компании из списка, пропуская уже загруженные.
+        Возвращает ID загруженных, пропущенных и не загруженных компаний.
+        """
+        employer_ids = list(dict.fromkeys(employer_ids))
+        self._employers = sorted(employer_ids)
+        self._load_checkpoint()
+        finished = self._done | self._not_found
+        skipped = [company_id for company_id in employer_ids if company_id in finished]
+        pending = [company_id for company_id in employer_ids if company_id not in finished]
+        self._total = len(employer_ids)
+        if skipped:
+            logger.info(
+                f"Пропускаем {len(skipped)} компаний, загруженных при прошлом запуске."
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="loader"
+        ) as executor:
+            results = list(executor.map(self._process, pending))
+
+        failed = [c for c, ok in zip(pending, results) if not ok]
+        # Полностью завершенный запуск не должен влиять на следующий,
+        # даже если в списке остались ненайденные компании
+        retryable = [c for c in failed if c not in self._not_found]
+        if not retryable and self.checkpoint_path is not None:
+            self.checkpoint_path.unlink(missing_ok=True)
+        return {
+            "loaded": [c for c, ok in zip(pending, results) if ok],
+            "skipped": skipped,
+            "failed": failed,
+        }
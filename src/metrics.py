@@ -0,0 +1,220 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.file_manager import FileManager
+
+# Границы корзин гистограмм длительности в секундах
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    inner = ",".join(f'{k}="{v}"' for k, v in items)
+    return f"{{{inner}}}"
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами в формате Prometheus."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Оценивает квантиль по верхней границе корзины."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """Потокобезопасный реестр счетчиков и гистограмм.
+
+    Метрики идентифицируются именем и набором меток. Запись стоит
+    одного захвата блокировки и нескольких операций со словарем,
+    поэтому реестр можно не отключать в рабочем режиме.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Задает описание метрики для вывода в формате Prometheus."""
+        self._help[name] = help_text
+
+    def inc(
+        self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1
+    ) -> None:
+        """Увеличивает счетчик."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(
+        self, name: str, value: float, labels: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Добавляет наблюдение в гистограмму."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, labels: Optional[Dict[str, str]] = None) -> Iterator[None]:
+        """Замеряет длительность блока и записывает ее в гистограмму."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def get(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """Возвращает значение счетчика (0, если его нет)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def reset(self) -> None:
+        """Удаляет все накопленные значения."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render_prometheus(self) -> str:
+        """Формирует текст в формате экспозиции Prometheus."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, hist in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        bucket = _format_labels(labels, ("le", f"{bound:g}"))
+                        lines.append(f"{name}_bucket{bucket} {cumulative}")
+                    bucket = _format_labels(labels, ("le", "+Inf"))
+                    lines.append(f"{name}_bucket{bucket} {hist.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {hist.sum:g}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, filepath: Path) -> None:
+        """Сохраняет метрики в файл в формате Prometheus."""
+        FileManager().write_file(filepath, self.render_prometheus())
+
+    def summary(self) -> str:
+        """Формирует краткую сводку по всем метрикам для вывода в лог."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                for labels, hist in sorted(series.items()):
+                    label_text = ", ".join(f"{k}={v}" for k, v in labels)
+                    lines.append(
+                        f"{name} [{label_text}]: вызовов {hist.count}, "
+                        f"всего {hist.sum:.3f} с, "
+                        f"среднее {hist.sum / hist.count * 1000:.1f} мс, "
+                        f"p95 <= {hist.quantile(0.95) * 1000:g} мс"
+                    )
+            for name, series in sorted(self._counters.items()):
+                for labels, value in sorted(series.items()):
+                    label_text = ", ".join(f"{k}={v}" for k, v in labels)
+                    lines.append(f"{name} [{label_text}]: {value:g}")
+        return "\n".join(lines)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Запускает в фоновом потоке HTTP-сервер, отдающий /metrics."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                payload = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# Общий реестр процесса
+metrics = MetricsRegistry()
+metrics.describe("hh_api_requests_total", "Запросы к API hh.ru по эндпоинту и статусу.")
+metrics.describe("hh_api_request_seconds", "Длительность запросов к API hh.ru.")
+metrics.describe("hh_api_response_bytes_total", "Объем полученных от API hh.ru данных.")
+metrics.describe("hh_api_retries_total", "Повторные запросы к API hh.ru.")
+metrics.describe("hh_api_cache_total", "Ответы API hh.ru, взятые из кэша.")
+metrics.describe(
+    "hh_api_truncated_vacancies_total",
+    "Вакансии сверх лимита поиска hh.ru, которые не удалось загрузить.",
+)
+metrics.describe("db_checkout_seconds", "Время получения соединения из пула.")
+metrics.describe("db_method_seconds", "Длительность методов DBManager.")
+metrics.describe("db_method_errors_total", "Ошибки в методах DBManager.")
+metrics.describe("db_rows_total", "Строки, затронутые методами DBManager.")
+
+
+def instrumented(func: Callable) -> Callable:
+    """Декоратор метода DBManager: записывает длительность и ошибки."""
+    labels = {"method": func.__name__}
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            metrics.inc("db_method_errors_total", labels)
+            raise
+        finally:
+            metrics.observe("db_method_seconds", time.perf_counter() - start, labels)
+
+    return wrapper
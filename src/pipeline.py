@@ -0,0 +1,153 @@
+import queue
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+from src.api import HhApiClient
+from src.db_manager import DBManager
+from src.salary import CurrencyRates, normalize_vacancies
+
+# Маркер конца потока данных между стадиями
+_DONE = object()
+
+
+def _put(out: queue.Queue, item, stop: threading.Event) -> bool:
+    """Кладет элемент в ограниченную очередь, ожидая места,
+    пока конвейер не остановлен. Возвращает False при остановке.
+    """
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(source: queue.Queue, stop: threading.Event):
+    """Забирает элемент из очереди; при остановке конвейера возвращает _DONE."""
+    while not stop.is_set():
+        try:
+            return source.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+class VacancyPipeline:
+    """Потоковый конвейер загрузки вакансий: API -> нормализация -> база данных.
+
+    Стадии работают в отдельных потоках и связаны очередями длиной
+    queue_size. Когда база не успевает, очереди заполняются и загрузка
+    из API приостанавливается, поэтому в памяти одновременно находится
+    не больше нескольких страниц, а сеть и запись в базу идут параллельно.
+    """
+
+    def __init__(
+        self,
+        api_client: HhApiClient,
+        db_manager: DBManager,
+        batch_size: int = 500,
+        queue_size: int = 4,
+        rates: Optional[CurrencyRates] = None,
+    ):
+        self.api_client = api_client
+        self.db_manager = db_manager
+        self.rates = rates
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    def run(
+        self, company_id: str, company_id_in_db: int, date_from: Optional[str] = None
+    ) -> int:
+        """Загружает вакансии компании в базу данных пачками по batch_size.
+        Возвращает число записанных вакансий.
+        """
+        stop = threading.Event()
+        errors: List[BaseException] = []
+        pages: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        rows: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        stages = [
+            threading.Thread(
+                target=self._produce,
+                args=(
+                    self.api_client.iter_vacancy_pages(company_id, date_from),
+                    pages,
+                    stop,
+                    errors,
+                ),
+                name=f"fetch-{company_id}",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._transform,
+                args=(pages, rows, self._normalize, stop, errors),
+                name=f"normalize-{company_id}",
+                daemon=True,
+            ),
+        ]
+        for stage in stages:
+            stage.start()
+
+        count = 0
+        try:
+            batch: List[Dict] = []
+            while (items := _get(rows, stop)) is not _DONE:
+                batch.extend(items)
+                while len(batch) >= self.batch_size:
+                    count += self._flush(batch[: self.batch_size], company_id_in_db)
+                    batch = batch[self.batch_size :]
+            if errors:
+                raise errors[0]
+            if batch:
+                count += self._flush(batch, company_id_in_db)
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+        return count
+
+    def _normalize(self, items: List[Dict]) -> List[Dict]:
+        """Стадия нормализации страницы вакансий."""
+        return normalize_vacancies(items, self.rates)
+
+    def _flush(self, batch: List[Dict], company_id_in_db: int) -> int:
+        """Записывает пачку вакансий в базу одной транзакцией."""
+        return self.db_manager.insert_vacancy_rows(
+            batch, company_id_in_db, self.batch_size
+        )
+
+    @staticmethod
+    def _produce(
+        source: Iterable,
+        out: queue.Queue,
+        stop: threading.Event,
+        errors: List[BaseException],
+    ) -> None:
+        """Стадия-источник: перекладывает элементы итератора в очередь."""
+        try:
+            for item in source:
+                if not _put(out, item, stop):
+                    return
+        except Exception as error:
+            errors.append(error)
+        finally:
+            _put(out, _DONE, stop)
+
+    @staticmethod
+    def _transform(
+        source: queue.Queue,
+        out: queue.Queue,
+        func: Callable,
+        stop: threading.Event,
+        errors: List[BaseException],
+    ) -> None:
+        """Промежуточная стадия: применяет func к элементам очереди."""
+        try:
+            while (item := _get(source, stop)) is not _DONE:
+                if not _put(out, func(item), stop):
+                    return
+        except Exception as error:
+            errors.append(error)
+        finally:
+            _put(out, _DONE, stop)
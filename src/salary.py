@@ -0,0 +1,110 @@
+import logging
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.file_manager import FileManager
+from src.utils import normalize_vacancy
+
+logger = logging.getLogger(__name__)
+# Доля зарплаты "на руки" после НДФЛ 13%
+NET_FACTOR = 0.87
+# Валюта, в которой хранится нормализованная зарплата
+BASE_CURRENCY = "RUR"
+
+
+class CurrencyRates:
+    """Таблица курсов валют в формате справочника hh.ru /dictionaries:
+    rate - сколько единиц валюты стоит один рубль.
+
+    Таблица загружается один раз и переиспользуется для всех пачек;
+    при заданном в HhApiClient кэше ответов справочник хранится на диске.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.rates = {BASE_CURRENCY: 1.0, **(rates or {})}
+        # Валюты без курса, о которых уже предупредили в логе
+        self._unknown: set = set()
+
+    @staticmethod
+    def _parse(dictionaries: Dict) -> Dict[str, float]:
+        """Извлекает курсы из справочника hh.ru."""
+        return {
+            currency["code"]: float(currency["rate"])
+            for currency in dictionaries.get("currency", [])
+            if currency.get("rate")
+        }
+
+    @classmethod
+    def from_file(cls, filepath: Path) -> "CurrencyRates":
+        """Загружает курсы из JSON-файла со справочником hh.ru."""
+        return cls(cls._parse(FileManager().load_json(filepath)))
+
+    @classmethod
+    def from_api(cls, api_client) -> "CurrencyRates":
+        """Загружает курсы из справочника API hh.ru.
+        Если справочник недоступен, выбрасывает requests.RequestException.
+        """
+        rates = cls._parse(api_client.get_dictionaries())
+        if not rates:
+            logger.warning("Справочник hh.ru не содержит курсов валют.")
+        return cls(rates)
+
+    def lookup(self, codes: np.ndarray) -> np.ndarray:
+        """Возвращает курсы для массива кодов валют (NaN для неизвестных)."""
+        unique, inverse = np.unique(codes, return_inverse=True)
+        table = np.array([self.rates.get(code, np.nan) for code in unique], dtype=float)
+        unknown = {str(code) for code in unique if code not in self.rates} - self._unknown
+        if unknown:
+            self._unknown |= unknown
+            logger.warning(
+                f"Нет курса для валют: {', '.join(sorted(unknown))}. "
+                "Зарплата в них не учитывается в salary, исходные значения "
+                "сохраняются в salary_from, salary_to и salary_currency."
+            )
+        return table[inverse]
+
+
+# Таблица по умолчанию, общая для всех пачек, чтобы предупреждение
+# о валютах без курса выводилось один раз, а не для каждой пачки
+ROUBLES_ONLY = CurrencyRates()
+
+
+def normalize_salaries(
+    salaries: Sequence[Optional[Dict]], rates: Optional[CurrencyRates] = None
+) -> np.ndarray:
+    """Векторно рассчитывает зарплату "на руки" в рублях для пачки вакансий.
+    Берется середина вилки from/to или имеющаяся граница, сумма переводится
+    в рубли по курсу и уменьшается на НДФЛ, если указана до вычета налога.
+    Возвращает массив float, NaN - зарплата не указана или валюта неизвестна.
+    """
+    rates = rates or ROUBLES_ONLY
+    salaries = [salary or {} for salary in salaries]
+    low = np.array([s.get("from") for s in salaries], dtype=float)
+    high = np.array([s.get("to") for s in salaries], dtype=float)
+    gross = np.array([bool(s.get("gross")) for s in salaries], dtype=bool)
+    codes = np.array([s.get("currency") or BASE_CURRENCY for s in salaries], dtype=str)
+
+    midpoint = np.where(
+        np.isnan(low), high, np.where(np.isnan(high), low, (low + high) / 2)
+    )
+    rub = midpoint / rates.lookup(codes) if len(codes) else midpoint
+    return np.where(gross, rub * NET_FACTOR, rub)
+
+
+def normalize_vacancies(
+    vacancies: Sequence[Dict], rates: Optional[CurrencyRates] = None
+) -> List[Dict]:
+    """Нормализует пачку вакансий: поля как в utils.normalize_vacancy,
+    а salary - зарплата "на руки" в рублях из normalize_salaries.
+    Для валют без курса salary - None: в рублевый столбец не должны
+    попадать суммы в другой валюте, исходная вилка остается в salary_from,
+    salary_to и salary_currency.
+    """
+    rows = [normalize_vacancy(vacancy) for vacancy in vacancies]
+    salaries = normalize_salaries([vacancy.get("salary") for vacancy in vacancies], rates)
+    for row, value in zip(rows, np.rint(salaries).tolist()):
+        row["salary"] = None if math.isnan(value) else int(value)
+    return rows
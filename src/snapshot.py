@@ -0,0 +1,170 @@
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.api import HhApiClient
+from src.db_manager import DBManager
+from src.file_manager import FileManager
+from src.salary import CurrencyRates, normalize_vacancies
+
+# Плоская схема вакансии в колоночном снимке
+PARQUET_COLUMNS = [
+    "id",
+    "name",
+    "alternate_url",
+    "published_at",
+    "area_name",
+    "employer_id",
+    "employer_name",
+    "salary_from",
+    "salary_to",
+    "salary_currency",
+    "salary_gross",
+]
+
+
+def _import_pyarrow():
+    """Импортирует pyarrow, который нужен только для снимков Parquet."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Для снимков .parquet установите пакет pyarrow.") from error
+    return pyarrow
+
+
+def _is_parquet(filepath: Path) -> bool:
+    return Path(filepath).suffix == ".parquet"
+
+
+def _flatten(vacancy: Dict) -> Dict:
+    """Преобразует вакансию из ответа API в строку колоночного снимка."""
+    salary = vacancy.get("salary") or {}
+    employer = vacancy.get("employer") or {}
+    return {
+        "id": vacancy.get("id"),
+        "name": vacancy.get("name"),
+        "alternate_url": vacancy.get("alternate_url"),
+        "published_at": vacancy.get("published_at"),
+        "area_name": (vacancy.get("area") or {}).get("name"),
+        "employer_id": employer.get("id"),
+        "employer_name": employer.get("name"),
+        "salary_from": salary.get("from"),
+        "salary_to": salary.get("to"),
+        "salary_currency": salary.get("currency"),
+        "salary_gross": salary.get("gross"),
+    }
+
+
+def _unflatten(row: Dict) -> Dict:
+    """Восстанавливает вакансию в формате ответа API из строки снимка."""
+    salary = None
+    if row["salary_from"] is not None or row["salary_to"] is not None:
+        salary = {
+            "from": row["salary_from"],
+            "to": row["salary_to"],
+            "currency": row["salary_currency"],
+            "gross": row["salary_gross"],
+        }
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "alternate_url": row["alternate_url"],
+        "published_at": row["published_at"],
+        "area": {"name": row["area_name"]},
+        "employer": {"id": row["employer_id"], "name": row["employer_name"]},
+        "salary": salary,
+    }
+
+
+def _parquet_schema(pa):
+    """Схема колоночного снимка в порядке PARQUET_COLUMNS."""
+    types = {
+        "salary_from": pa.int64(),
+        "salary_to": pa.int64(),
+        "salary_gross": pa.bool_(),
+    }
+    return pa.schema(
+        [(column, types.get(column, pa.string())) for column in PARQUET_COLUMNS]
+    )
+
+
+def write_snapshot(
+    filepath: Path, vacancies: Iterable[Dict], batch_size: int = 10000
+) -> int:
+    """Записывает вакансии в снимок и возвращает их число.
+    Формат выбирается по расширению: .parquet - колоночный файл,
+    записываемый группами строк по batch_size; иначе NDJSON,
+    сжатый для .gz и .zst.
+    """
+    if not _is_parquet(filepath):
+        return FileManager().dump_ndjson(filepath, vacancies)
+
+    pa = _import_pyarrow()
+    schema = _parquet_schema(pa)
+    count = 0
+    iterator = iter(vacancies)
+    with pa.parquet.ParquetWriter(str(filepath), schema, compression="zstd") as writer:
+        while chunk := [_flatten(v) for v in islice(iterator, batch_size)]:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            count += len(chunk)
+    return count
+
+
+def read_snapshot(filepath: Path, batch_size: int = 10000) -> Iterator[List[Dict]]:
+    """Читает вакансии из снимка пачками по batch_size, не загружая файл
+    целиком. Файл Parquet отображается в память.
+    """
+    if not _is_parquet(filepath):
+        iterator = FileManager().iter_ndjson(filepath)
+        while chunk := list(islice(iterator, batch_size)):
+            yield chunk
+        return
+
+    pa = _import_pyarrow()
+    parquet_file = pa.parquet.ParquetFile(str(filepath), memory_map=True)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield [_unflatten(row) for row in batch.to_pylist()]
+
+
+def export_snapshot(
+    api_client: HhApiClient, employer_ids: Iterable[str], filepath: Path
+) -> int:
+    """Выгружает вакансии компаний из API в снимок по мере загрузки страниц.
+    Возвращает число записанных вакансий.
+    """
+    vacancies = (
+        vacancy
+        for employer_id in employer_ids
+        for page in api_client.iter_vacancy_pages(employer_id)
+        for vacancy in page
+    )
+    return write_snapshot(filepath, vacancies)
+
+
+def import_snapshot(
+    db_manager: DBManager,
+    filepath: Path,
+    batch_size: int = 10000,
+    rates: Optional[CurrencyRates] = None,
+) -> int:
+    """Загружает вакансии из снимка в базу данных пачками.
+    Компании создаются по полю employer вакансий. Возвращает число вакансий.
+    """
+    count = 0
+    for chunk in read_snapshot(filepath, batch_size):
+        employers: Dict[str, Dict] = {}
+        rows_by_employer: Dict[str, List[Dict]] = {}
+        for vacancy, row in zip(chunk, normalize_vacancies(chunk, rates)):
+            employer = vacancy.get("employer") or {}
+            employers.setdefault(
+                employer.get("id"),
+                {"id": employer.get("id"), "name": employer.get("name") or ""},
+            )
+            rows_by_employer.setdefault(employer.get("id"), []).append(row)
+        company_ids = db_manager.insert_companies_bulk(employers.values())
+        for employer_id, company_id in zip(employers, company_ids):
+            count += db_manager.insert_vacancy_rows(
+                rows_by_employer[employer_id], company_id, batch_size
+            )
+    return count
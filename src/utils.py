@@ -6,3 +6,20 @@ def normalize_salary(salary_dict: Dict) -> Optional[int]:
     if salary_dict is None:
         return None
     return salary_dict.get("from") or salary_dict.get("to")
+
+
+def normalize_vacancy(vacancy: Dict) -> Dict:
+    """Приводит вакансию из ответа API к полям таблицы vacancies.
+    Поле salary рассчитывается для всей пачки в salary.normalize_vacancies.
+    """
+    salary = vacancy.get("salary") or {}
+    return {
+        "hh_id": vacancy.get("id"),
+        "title": vacancy.get("name") or "",
+        "salary_from": salary.get("from"),
+        "salary_to": salary.get("to"),
+        "salary_currency": salary.get("currency"),
+        "salary_gross": salary.get("gross"),
+        "link": vacancy.get("alternate_url") or "",
+        "published_at": vacancy.get("published_at"),
+    }
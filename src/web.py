@@ -0,0 +1,103 @@
+from typing import Callable, Dict, List, Optional
+
+from flask import Flask, jsonify, request
+
+from src.cache import QueryCache
+from src.db_manager import DBManager
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class BadRequest(Exception):
+    """Некорректные параметры запроса к API чтения."""
+
+
+def _int_arg(name: str, default: Optional[int] = None) -> Optional[int]:
+    """Читает целочисленный параметр строки запроса."""
+    value = request.args.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise BadRequest(f"Параметр {name} должен быть целым числом.")
+
+
+def _page(items: List[Dict], limit: int) -> Dict:
+    """Оборачивает страницу результатов, добавляя ключ следующей страницы."""
+    next_after_id = items[-1]["id"] if len(items) == limit else None
+    return {"items": items, "next_after_id": next_after_id}
+
+
+def create_app(
+    db_manager: DBManager, cache_ttl: float = 5, cache_size: int = 256
+) -> Flask:
+    """Создает HTTP-сервис чтения данных о компаниях и вакансиях.
+
+    Результаты запросов кэшируются в памяти на cache_ttl секунд,
+    поэтому частые опросы дашбордов не доходят до базы данных.
+    Кэш сбрасывается запросом POST /api/cache/invalidate после загрузки.
+    """
+    app = Flask(__name__)
+    app.json.ensure_ascii = False
+    cache = QueryCache(ttl=cache_ttl, max_entries=cache_size)
+    app.extensions["query_cache"] = cache
+
+    def cached(compute: Callable, *key) -> Dict:
+        return cache.get_or_compute((request.path, *key), compute)
+
+    def page_args() -> tuple:
+        limit = _int_arg("limit", DEFAULT_PAGE_SIZE)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise BadRequest(f"Параметр limit должен быть от 1 до {MAX_PAGE_SIZE}.")
+        return limit, _int_arg("after_id")
+
+    @app.errorhandler(BadRequest)
+    def bad_request(error):
+        return jsonify({"error": str(error)}), 400
+
+    @app.get("/api/statistics")
+    def statistics():
+        def compute():
+            return {
+                **db_manager.get_statistics(),
+                "avg_salary": db_manager.get_avg_salary(),
+            }
+
+        return jsonify(cached(compute))
+
+    @app.get("/api/companies")
+    def companies():
+        limit, after_id = page_args()
+
+        def compute():
+            return _page(
+                db_manager.get_companies_and_vacancies_count(limit, after_id), limit
+            )
+
+        return jsonify(cached(compute, limit, after_id))
+
+    @app.get("/api/vacancies")
+    def vacancies():
+        limit, after_id = page_args()
+        keyword = request.args.get("keyword", "").strip()
+        higher_salary = request.args.get("higher_salary") in ("1", "true")
+        if not keyword and not higher_salary:
+            raise BadRequest("Укажите keyword или higher_salary=1.")
+
+        def compute():
+            if keyword:
+                items = db_manager.get_vacancies_with_keyword(keyword, limit, after_id)
+            else:
+                items = db_manager.get_vacancies_with_higher_salary(limit, after_id)
+            return _page(items, limit)
+
+        return jsonify(cached(compute, keyword, higher_salary, limit, after_id))
+
+    @app.post("/api/cache/invalidate")
+    def invalidate():
+        cache.clear()
+        return jsonify({"status": "ok"})
+
+    return app
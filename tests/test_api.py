@@ -0,0 +1,240 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+from src.api import HhApiClient, HhApiError, OfflineCacheMiss, TokenBucket
+from src.cache import ResponseCache
+from src.metrics import metrics
+
+
+class StubHhHandler(BaseHTTPRequestHandler):
+    """Заглушка API hh.ru: одна компания с заданным числом вакансий."""
+
+    vacancies_count = 250
+    requests_log = []
+    # Страницы вакансий, на которые заглушка отвечает ошибкой 500
+    failing_pages = set()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.requests_log.append((url.path, params))
+        if url.path == "/employers/1":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self._send_json(
+                200,
+                {"id": "1", "name": "Stub", "description": "Заглушка"},
+                {"ETag": '"v1"'},
+            )
+        elif url.path == "/vacancies":
+            per_page = int(params["per_page"])
+            page = int(params["page"])
+            if page in self.failing_pages:
+                self._send_json(500, {"errors": [{"type": "server_error"}]})
+                return
+            # Как и hh.ru, для неизвестной компании поиск пуст
+            total = self.vacancies_count if params.get("employer_id") == "1" else 0
+            items = [
+                {"id": str(i), "name": f"Вакансия {i}"}
+                for i in range(page * per_page, min((page + 1) * per_page, total))
+            ]
+            pages = (total + per_page - 1) // per_page
+            self._send_json(
+                200,
+                {"items": items, "found": total, "pages": pages, "page": page},
+            )
+        elif url.path == "/employers/500":
+            self._send_json(500, {"errors": [{"type": "server_error"}]})
+        else:
+            self._send_json(404, {"errors": [{"type": "not_found"}]})
+
+
+class StubServerMixin:
+    """Запускает заглушку API hh.ru на время тестов класса."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHhHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+class TestHhApiClient(StubServerMixin, unittest.TestCase):
+    def setUp(self):
+        StubHhHandler.requests_log.clear()
+        self.client = HhApiClient(
+            base_url=self.base_url, max_workers=4, per_page=100, retries=0
+        )
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_get_company(self):
+        """Проверяет получение данных о компании."""
+        company = self.client.get_company("1")
+        self.assertEqual(company["name"], "Stub")
+
+    def test_request_metrics(self):
+        """Проверяет учет запросов к API в метриках."""
+        labels = {"endpoint": "employers", "status": 200}
+        before = metrics.get("hh_api_requests_total", labels)
+        self.client.get_company("1")
+        self.client.get_company("1")
+        self.assertGreaterEqual(metrics.get("hh_api_requests_total", labels), before + 1)
+
+    def test_get_company_not_found(self):
+        """Проверяет, что для неизвестной компании возвращается None."""
+        self.assertIsNone(self.client.get_company("404"))
+
+    def test_get_vacancies_by_company(self):
+        """Проверяет загрузку всех страниц вакансий по полю pages."""
+        vacancies = self.client.get_vacancies_by_company("1")
+        self.assertEqual([v["id"] for v in vacancies], [str(i) for i in range(250)])
+        pages = sorted(int(p["page"]) for path, p in StubHhHandler.requests_log)
+        self.assertEqual(pages, [0, 1, 2])
+
+    def test_search_depth_limit_logged(self):
+        """Проверяет предупреждение о вакансиях сверх лимита поиска hh.ru."""
+        self.addCleanup(setattr, StubHhHandler, "vacancies_count", 250)
+        StubHhHandler.vacancies_count = 2150
+        before = metrics.get("hh_api_truncated_vacancies_total")
+        with self.assertLogs("src.api", "WARNING") as logs:
+            vacancies = self.client.get_vacancies_by_company("1")
+        self.assertEqual(len(vacancies), 2000)
+        self.assertIn("компании 1", logs.output[0])
+        self.assertIn("150", logs.output[0])
+        self.assertEqual(metrics.get("hh_api_truncated_vacancies_total"), before + 150)
+
+    def test_failed_page_raises(self):
+        """Проверяет, что ошибка любой страницы не обрывает выборку молча."""
+        self.addCleanup(setattr, StubHhHandler, "failing_pages", set())
+        for page in (0, 1):
+            StubHhHandler.failing_pages = {page}
+            with self.assertRaises(HhApiError):
+                self.client.get_vacancies_by_company("1")
+
+    def test_get_company_server_error(self):
+        """Проверяет, что ошибка сервера отличается от ненайденной компании."""
+        with self.assertRaises(HhApiError):
+            self.client.get_company("500")
+
+    def test_get_dictionaries_unavailable(self):
+        """Проверяет, что недоступные справочники не подменяются пустыми."""
+        with self.assertRaises(HhApiError):
+            self.client.get_dictionaries()
+
+    def test_get_vacancies_date_from(self):
+        """Проверяет передачу отметки инкрементальной загрузки в запрос."""
+        self.client.get_vacancies_by_companies(
+            ["1"], date_from={"1": "2024-05-01T00:00:00+03:00"}
+        )
+        dates = {p.get("date_from") for path, p in StubHhHandler.requests_log}
+        self.assertEqual(dates, {"2024-05-01T00:00:00+03:00"})
+
+    def test_get_vacancies_by_companies(self):
+        """Проверяет параллельную загрузку вакансий нескольких компаний."""
+        result = self.client.get_vacancies_by_companies(["1", "404"])
+        self.assertEqual(len(result["1"]), 250)
+        self.assertEqual(result["404"], [])
+
+
+class TestResponseCache(StubServerMixin, unittest.TestCase):
+    def setUp(self):
+        StubHhHandler.requests_log.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(Path(self.tmp_dir.name), ttl=60)
+        self.client = HhApiClient(base_url=self.base_url, cache=self.cache)
+
+    def tearDown(self):
+        self.client.close()
+        self.tmp_dir.cleanup()
+
+    def test_fresh_entry_served_from_cache(self):
+        """Проверяет, что свежий ответ не запрашивается повторно."""
+        self.client.get_company("1")
+        self.assertEqual(self.client.get_company("1")["name"], "Stub")
+        self.assertEqual(len(StubHhHandler.requests_log), 1)
+
+    def test_stale_entry_revalidated(self):
+        """Проверяет, что устаревшая запись перепроверяется по ETag."""
+        self.cache.ttl = 0
+        self.client.get_company("1")
+        self.assertEqual(self.client.get_company("1")["name"], "Stub")
+        self.assertEqual(len(StubHhHandler.requests_log), 2)
+
+    def test_offline_replay(self):
+        """Проверяет работу по записанному кэшу без обращения к сети."""
+        self.client.get_vacancies_by_company("1")
+        StubHhHandler.requests_log.clear()
+        offline = HhApiClient(base_url=self.base_url, cache=self.cache, offline=True)
+        self.assertEqual(len(offline.get_vacancies_by_company("1")), 250)
+        with self.assertRaises(OfflineCacheMiss):
+            offline.get_company("1")
+        self.assertEqual(StubHhHandler.requests_log, [])
+        offline.close()
+
+    def test_entries_stored_compact(self):
+        """Проверяет, что записи кэша сохраняются без отступов."""
+        self.client.get_company("1")
+        (path,) = Path(self.tmp_dir.name).glob("*.json")
+        self.assertNotIn("\n", path.read_text(encoding="utf-8"))
+
+    def test_offline_requires_cache(self):
+        """Проверяет, что автономный режим без кэша запрещен."""
+        with self.assertRaises(ValueError):
+            HhApiClient(offline=True)
+
+    def test_lru_eviction(self):
+        """Проверяет вытеснение давно использованных записей."""
+        self.cache.set("a", None, {"x": "a" * 100})
+        size = self.cache._index[ResponseCache.make_key("a")][0]
+        # Запас на разную длину stored_at в JSON записей
+        self.cache.max_size = size * 2 + 16
+        self.cache.set("b", None, {"x": "b" * 100})
+        time.sleep(0.01)
+        self.cache.get("a")
+        self.cache.set("c", None, {"x": "c" * 100})
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_rate_limit(self):
+        """Проверяет, что токены сверх ёмкости выдаются с задержкой."""
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from src.daemon import CommandServer, DaemonError, send_command
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestCommandServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = Path(self.tmp_dir.name) / "hh.sock"
+        self.calls = []
+
+        def show(params):
+            self.calls.append(("show", params))
+            return "Количество компаний: 3"
+
+        def fail(params):
+            raise RuntimeError("нет соединения с базой")
+
+        self.server = CommandServer(
+            self.socket_path, {"show": show, "load": fail}, exclusive=("load",)
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp_dir.cleanup()
+
+    def test_command(self):
+        """Проверяет выполнение команды с параметрами через сокет."""
+        output = send_command(self.socket_path, "show", {"limit": 1}, timeout=5)
+        self.assertEqual(output, "Количество компаний: 3")
+        self.assertEqual(self.calls, [("show", {"limit": 1})])
+
+    def test_errors(self):
+        """Проверяет, что ошибки команд возвращаются клиенту."""
+        with self.assertRaisesRegex(DaemonError, "нет соединения"):
+            send_command(self.socket_path, "load", timeout=5)
+        with self.assertRaisesRegex(DaemonError, "Неизвестная команда"):
+            send_command(self.socket_path, "drop", timeout=5)
+
+    def test_single_instance(self):
+        """Проверяет, что второй процесс не занимает сокет работающего."""
+        with self.assertRaises(DaemonError):
+            CommandServer(self.socket_path, {})
+
+    def test_socket_permissions(self):
+        """Проверяет, что сокет доступен только владельцу."""
+        mode = stat.S_IMODE(self.socket_path.stat().st_mode)
+        self.assertEqual(mode, 0o600)
+
+    def test_path_not_socket(self):
+        """Проверяет, что чужой файл или каталог на месте сокета не удаляется."""
+        path = Path(self.tmp_dir.name) / "busy"
+        path.mkdir()
+        with self.assertRaises(DaemonError):
+            CommandServer(path, {})
+        self.assertTrue(path.is_dir())
+
+    def test_stale_socket(self):
+        """Проверяет, что сокет завершившегося процесса удаляется при запуске."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        # Сокет без процесса, как после аварийного завершения
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(str(self.socket_path))
+        self.server = CommandServer(self.socket_path, {})
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.assertEqual(send_command(self.socket_path, "ping", timeout=5), "pong")
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_main_import(self):
+        """Проверяет, что запуск main.py не импортирует тяжелые подсистемы."""
+        code = (
+            "import sys, main; "
+            "print(sorted({'requests', 'psycopg2', 'numpy', 'flask', 'dotenv'}"
+            " & set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
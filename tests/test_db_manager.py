@@ -1,4 +1,5 @@
 import unittest
+from datetime import datetime, timezone
 from src.db_manager import DBManager
 from dotenv import load_dotenv
 import os
@@ -27,6 +28,7 @@ class TestDBManager(unittest.TestCase):
     def tearDown(self):
         """Освобождаем ресурсы после теста."""
         self.db_manager.clear_database()
+        self.db_manager.close()
 
     def test_create_database(self):
         """Проверяет создание базы данных."""
@@ -71,6 +73,44 @@ class TestDBManager(unittest.TestCase):
         }
         self.db_manager.insert_vacancy(vacancy_data, company_id)
 
+    def test_insert_vacancy_without_salary(self):
+        """Проверяет вставку вакансии без указанной зарплаты."""
+        company_id = self.db_manager.insert_company(
+            {"name": "Google", "description": "Компания Google"}
+        )
+        vacancy_data = {
+            "name": "Стажёр",
+            "salary": None,
+            "alternate_url": "https://hh.ru/vacancy/12346",
+        }
+        self.db_manager.insert_vacancy(vacancy_data, company_id)
+
+    def test_insert_bulk(self):
+        """Проверяет пакетную вставку компаний и вакансий."""
+        company_ids = self.db_manager.insert_companies_bulk(
+            [
+                {"name": "Яндекс", "description": "Поисковик"},
+                {"name": "Сбер", "description": None},
+            ],
+            batch_size=1,
+        )
+        self.assertEqual(len(company_ids), 2)
+        vacancies = (
+            {
+                "name": f"Разработчик {i}",
+                "salary": {"from": None, "to": 1000 * i},
+                "alternate_url": f"https://hh.ru/vacancy/{i}",
+            }
+            for i in range(5)
+        )
+        inserted = self.db_manager.insert_vacancies_bulk(
+            vacancies, company_ids[0], batch_size=2
+        )
+        self.assertEqual(inserted, 5)
+        stats = self.db_manager.get_statistics()
+        self.assertEqual(stats["num_companies"], 2)
+        self.assertEqual(stats["num_vacancies"], 5)
+
     def test_get_statistics(self):
         """Проверяет получение статистики по базе данных."""
         # Вставляем тестовые данные
@@ -89,6 +129,116 @@ class TestDBManager(unittest.TestCase):
         self.assertEqual(stats["num_companies"], 1)
         self.assertEqual(stats["num_vacancies"], 1)
 
+    def test_upsert_by_hh_id(self):
+        """Проверяет, что повторная загрузка обновляет записи без дублей."""
+        company = {"id": "1740", "name": "Яндекс", "description": "Поисковик"}
+        first_id = self.db_manager.insert_company(company)
+        second_id = self.db_manager.insert_company({**company, "name": "Яндекс 2"})
+        self.assertEqual(first_id, second_id)
+        vacancy = {
+            "id": "100",
+            "name": "Аналитик",
+            "salary": {"from": 100000},
+            "alternate_url": "https://hh.ru/vacancy/100",
+            "published_at": "2024-05-01T12:00:00+0300",
+        }
+        self.db_manager.insert_vacancies_bulk([vacancy, vacancy], first_id)
+        self.db_manager.insert_vacancy(vacancy, first_id)
+        stats = self.db_manager.get_statistics()
+        self.assertEqual(stats["num_companies"], 1)
+        self.assertEqual(stats["num_vacancies"], 1)
+
+    def test_sync_state(self):
+        """Проверяет сохранение отметки инкрементальной синхронизации."""
+        self.assertIsNone(self.db_manager.get_sync_state("1740"))
+        company_id = self.db_manager.insert_company(
+            {"id": "1740", "name": "Яндекс", "description": None}
+        )
+        self.db_manager.insert_vacancies_bulk(
+            [
+                {"id": "1", "name": "A", "published_at": "2024-05-01T12:00:00+0300"},
+                {"id": "2", "name": "B", "published_at": "2024-05-03T12:00:00+0300"},
+            ],
+            company_id,
+        )
+        self.db_manager.update_sync_state("1740")
+        last_published_at = self.db_manager.get_sync_state("1740")
+        self.assertEqual(
+            last_published_at, datetime(2024, 5, 3, 9, tzinfo=timezone.utc)
+        )
+
+    def _insert_analytics_data(self):
+        """Вставляет две компании с вакансиями для проверки аналитики."""
+        yandex, google = self.db_manager.insert_companies_bulk(
+            [
+                {"id": "1", "name": "Яндекс", "description": None},
+                {"id": "2", "name": "Google", "description": None},
+            ]
+        )
+        self.db_manager.insert_vacancies_bulk(
+            [
+                {"id": "10", "name": "Python-разработчик", "salary": {"from": 100000}},
+                {"id": "11", "name": "Аналитик", "salary": {"from": 200000}},
+                {"id": "12", "name": "Разработчик 100%_python", "salary": None},
+            ],
+            yandex,
+        )
+        return yandex, google
+
+    def test_get_companies_and_vacancies_count(self):
+        """Проверяет подсчет вакансий по компаниям с постраничной выборкой."""
+        yandex, google = self._insert_analytics_data()
+        rows = self.db_manager.get_companies_and_vacancies_count()
+        counts = {row["name"]: row["vacancies_count"] for row in rows}
+        self.assertEqual(counts, {"Яндекс": 3, "Google": 0})
+        page = self.db_manager.get_companies_and_vacancies_count(limit=1)
+        self.assertEqual([row["id"] for row in page], [yandex])
+        page = self.db_manager.get_companies_and_vacancies_count(
+            limit=1, after_id=page[-1]["id"]
+        )
+        self.assertEqual([row["id"] for row in page], [google])
+
+    def test_get_avg_salary(self):
+        """Проверяет расчет средней зарплаты и отбор вакансий выше средней."""
+        self.assertIsNone(self.db_manager.get_avg_salary())
+        self._insert_analytics_data()
+        self.assertEqual(self.db_manager.get_avg_salary(), 150000)
+        higher = self.db_manager.get_vacancies_with_higher_salary()
+        self.assertEqual([row["title"] for row in higher], ["Аналитик"])
+        self.assertEqual(higher[0]["company_name"], "Яндекс")
+
+    def test_get_vacancies_with_keyword(self):
+        """Проверяет поиск вакансий по слову в названии."""
+        self._insert_analytics_data()
+        titles = [
+            row["title"]
+            for row in self.db_manager.get_vacancies_with_keyword("PYTHON")
+        ]
+        self.assertEqual(titles, ["Python-разработчик", "Разработчик 100%_python"])
+        titles = [
+            row["title"] for row in self.db_manager.get_vacancies_with_keyword("%_")
+        ]
+        self.assertEqual(titles, ["Разработчик 100%_python"])
+
+    def test_connection_pool_reuse(self):
+        """Проверяет, что соединения берутся из пула повторно."""
+        with self.db_manager.connection() as conn:
+            first = conn
+        with self.db_manager.connection() as conn:
+            self.assertIs(conn, first)
+
+    def test_connection_rollback_on_error(self):
+        """Проверяет откат транзакции при ошибке внутри блока."""
+        with self.assertRaises(psycopg2.Error):
+            with self.db_manager.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        "INSERT INTO companies (name) VALUES ('Откат');"
+                    )
+                    cur.execute("SELECT * FROM missing_table;")
+        stats = self.db_manager.get_statistics()
+        self.assertEqual(stats["num_companies"], 0)
+
     def test_clear_database(self):
         """Проверяет очистку базы данных."""
         # Предварительная очистка базы данных
@@ -0,0 +1,165 @@
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.api import HhApiClient
+from src.cache import ResponseCache
+from src.file_manager import FileManager
+from src.loader import EmployerLoader, read_employer_ids
+from tests.test_api import StubHhHandler, StubServerMixin
+from tests.test_pipeline import RecordingDBManager
+
+
+class FakeDBManager(RecordingDBManager):
+    """Приемник данных загрузчика вместо базы данных."""
+
+    def __init__(self, last_published_at=None):
+        super().__init__()
+        self.companies = []
+        self.synced = []
+        self.last_published_at = last_published_at
+
+    def insert_company(self, company_data):
+        self.companies.append(company_data["id"])
+        return len(self.companies)
+
+    def get_sync_state(self, employer_id):
+        return self.last_published_at
+
+    def update_sync_state(self, employer_id):
+        self.synced.append(employer_id)
+
+
+class TestEmployerLoader(StubServerMixin, unittest.TestCase):
+    def setUp(self):
+        StubHhHandler.requests_log.clear()
+        self.client = HhApiClient(base_url=self.base_url, max_workers=2, retries=0)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint = Path(self.tmp_dir.name) / "checkpoint.json"
+
+    def tearDown(self):
+        self.client.close()
+        self.tmp_dir.cleanup()
+
+    def _loader(self, db_manager, incremental=False):
+        return EmployerLoader(
+            self.client,
+            db_manager,
+            workers=2,
+            retries=2,
+            backoff=0,
+            checkpoint_path=self.checkpoint,
+            incremental=incremental,
+        )
+
+    def _employer_requests(self, company_id):
+        return [
+            path
+            for path, _ in StubHhHandler.requests_log
+            if path == f"/employers/{company_id}"
+        ]
+
+    def test_run_retries_and_checkpoint(self):
+        """Проверяет повторные попытки и запись контрольной точки."""
+        db_manager = FakeDBManager()
+        result = self._loader(db_manager).run(["1", "500", "1"])
+        self.assertEqual(result, {"loaded": ["1"], "skipped": [], "failed": ["500"]})
+        self.assertEqual(db_manager.synced, ["1"])
+        self.assertEqual(len(self._employer_requests("500")), 3)
+        self.assertEqual(
+            FileManager().load_json(self.checkpoint),
+            {"employers": ["1", "500"], "done": ["1"], "not_found": []},
+        )
+
+        result = self._loader(FakeDBManager()).run(["1", "500"])
+        self.assertEqual(result["skipped"], ["1"])
+
+    def test_checkpoint_for_other_list_ignored(self):
+        """Проверяет, что контрольная точка другого списка компаний
+        не пропускает загрузку.
+        """
+        self._loader(FakeDBManager()).run(["1", "500"])
+        db_manager = FakeDBManager()
+        result = self._loader(db_manager).run(["1"])
+        self.assertEqual(result, {"loaded": ["1"], "skipped": [], "failed": []})
+        self.assertEqual(db_manager.synced, ["1"])
+
+    def test_not_found_not_retried(self):
+        """Проверяет, что ненайденная компания не загружается повторно."""
+        result = self._loader(FakeDBManager()).run(["404"])
+        self.assertEqual(result["failed"], ["404"])
+        self.assertEqual(len(self._employer_requests("404")), 1)
+
+    def test_not_found_does_not_keep_checkpoint(self):
+        """Проверяет, что ненайденная компания не оставляет контрольную точку
+        и следующий запуск снова загружает остальные компании.
+        """
+        for _ in range(2):
+            db_manager = FakeDBManager()
+            result = self._loader(db_manager).run(["1", "404"])
+            self.assertEqual(result, {"loaded": ["1"], "skipped": [], "failed": ["404"]})
+            self.assertEqual(db_manager.synced, ["1"])
+            self.assertFalse(self.checkpoint.exists())
+
+    def test_offline_cache_miss_not_retried(self):
+        """Проверяет, что в автономном режиме компания без записи в кэше
+        не загружается повторно и не отмечается ненайденной.
+        """
+        cache = ResponseCache(Path(self.tmp_dir.name) / "cache")
+        self.client.close()
+        self.client = HhApiClient(base_url=self.base_url, cache=cache, offline=True)
+        with self.assertLogs("src.loader") as logs:
+            result = self._loader(FakeDBManager()).run(["1", "2"])
+        self.assertEqual(result, {"loaded": [], "skipped": [], "failed": ["1", "2"]})
+        self.assertEqual(StubHhHandler.requests_log, [])
+        self.assertFalse(any("Повтор" in line for line in logs.output))
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_failed_page_not_checkpointed(self):
+        """Проверяет, что компания с недополученной страницей повторяется
+        и не отмечается загруженной.
+        """
+        self.addCleanup(setattr, StubHhHandler, "failing_pages", set())
+        StubHhHandler.failing_pages = {1}
+        db_manager = FakeDBManager()
+        result = self._loader(db_manager).run(["1"])
+        self.assertEqual(result["failed"], ["1"])
+        self.assertEqual(len(self._employer_requests("1")), 3)
+        self.assertEqual(db_manager.synced, [])
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_incremental_failed_page_keeps_sync_state(self):
+        """Проверяет, что при ошибке страницы в инкрементальном режиме
+        отметка синхронизации не сдвигается.
+        """
+        self.addCleanup(setattr, StubHhHandler, "failing_pages", set())
+        StubHhHandler.failing_pages = {2}
+        db_manager = FakeDBManager(datetime(2024, 5, 1, tzinfo=timezone.utc))
+        result = self._loader(db_manager, incremental=True).run(["1"])
+        self.assertEqual(result["failed"], ["1"])
+        self.assertEqual(db_manager.synced, [])
+        dates = {
+            params.get("date_from")
+            for path, params in StubHhHandler.requests_log
+            if path == "/vacancies"
+        }
+        self.assertEqual(dates, {"2024-05-01T00:00:00+00:00"})
+
+    def test_checkpoint_removed_after_full_run(self):
+        """Проверяет удаление контрольной точки после полной загрузки."""
+        db_manager = FakeDBManager()
+        result = self._loader(db_manager).run(["1"])
+        self.assertEqual(result["loaded"], ["1"])
+        self.assertEqual(sum(len(rows) for _, rows in db_manager.batches), 250)
+        self.assertFalse(self.checkpoint.exists())
+
+    def test_read_employer_ids(self):
+        """Проверяет чтение списка компаний из файла."""
+        path = Path(self.tmp_dir.name) / "employers.txt"
+        FileManager().write_file(path, "1740  # Яндекс\n\n# комментарий\n3529\n")
+        self.assertEqual(read_employer_ids(path), ["1740", "3529"])
+
+
+if __name__ == "__main__":
+    unittest.main()
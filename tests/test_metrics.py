@@ -0,0 +1,46 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        """Проверяет накопление счетчика по меткам."""
+        self.registry.inc("requests_total", {"endpoint": "vacancies"})
+        self.registry.inc("requests_total", {"endpoint": "vacancies"}, 2)
+        self.assertEqual(self.registry.get("requests_total", {"endpoint": "vacancies"}), 3)
+        self.assertEqual(self.registry.get("requests_total", {"endpoint": "employers"}), 0)
+
+    def test_render_prometheus(self):
+        """Проверяет формат экспозиции счетчиков и гистограмм."""
+        self.registry.describe("request_seconds", "Длительность запросов.")
+        self.registry.inc("requests_total", {"status": 200})
+        self.registry.observe("request_seconds", 0.02, {"endpoint": "vacancies"})
+        self.registry.observe("request_seconds", 20, {"endpoint": "vacancies"})
+        text = self.registry.render_prometheus()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{status="200"} 1', text)
+        self.assertIn("# HELP request_seconds Длительность запросов.", text)
+        self.assertIn('request_seconds_bucket{endpoint="vacancies",le="0.01"} 0', text)
+        self.assertIn('request_seconds_bucket{endpoint="vacancies",le="0.025"} 1', text)
+        self.assertIn('request_seconds_bucket{endpoint="vacancies",le="+Inf"} 2', text)
+        self.assertIn('request_seconds_count{endpoint="vacancies"} 2', text)
+
+    def test_timer_and_dump(self):
+        """Проверяет замер длительности блока и сохранение в файл."""
+        with self.registry.timer("block_seconds"):
+            pass
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "metrics.prom"
+            self.registry.dump(path)
+            self.assertIn("block_seconds_count 1", path.read_text(encoding="utf-8"))
+        self.assertIn("block_seconds []: вызовов 1", self.registry.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
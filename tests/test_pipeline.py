@@ -0,0 +1,57 @@
+import unittest
+
+from src.api import HhApiClient
+from src.pipeline import VacancyPipeline
+from tests.test_api import StubServerMixin
+
+
+class RecordingDBManager:
+    """Приемник пачек вакансий вместо базы данных."""
+
+    def __init__(self, fail_after: int = None):
+        self.batches = []
+        self.fail_after = fail_after
+
+    def insert_vacancy_rows(self, rows, company_id, batch_size=1000):
+        if self.fail_after is not None and len(self.batches) >= self.fail_after:
+            raise RuntimeError("database is down")
+        self.batches.append((company_id, list(rows)))
+        return len(self.batches[-1][1])
+
+
+class TestVacancyPipeline(StubServerMixin, unittest.TestCase):
+    def setUp(self):
+        self.client = HhApiClient(base_url=self.base_url, max_workers=2, per_page=20)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_run_flushes_batches(self):
+        """Проверяет, что вакансии записываются пачками фиксированного размера."""
+        db_manager = RecordingDBManager()
+        pipeline = VacancyPipeline(self.client, db_manager, batch_size=30, queue_size=1)
+        count = pipeline.run("1", 7)
+        self.assertEqual(count, 250)
+        sizes = [len(rows) for _, rows in db_manager.batches]
+        self.assertEqual(sizes, [30] * 8 + [10])
+        first = db_manager.batches[0][1][0]
+        self.assertEqual(first["hh_id"], "0")
+        self.assertEqual(first["title"], "Вакансия 0")
+        self.assertTrue(all(company_id == 7 for company_id, _ in db_manager.batches))
+
+    def test_run_unknown_company(self):
+        """Проверяет, что для компании без вакансий ничего не записывается."""
+        db_manager = RecordingDBManager()
+        self.assertEqual(VacancyPipeline(self.client, db_manager).run("404", 1), 0)
+        self.assertEqual(db_manager.batches, [])
+
+    def test_run_propagates_sink_error(self):
+        """Проверяет, что ошибка записи останавливает конвейер."""
+        db_manager = RecordingDBManager(fail_after=1)
+        pipeline = VacancyPipeline(self.client, db_manager, batch_size=20, queue_size=1)
+        with self.assertRaises(RuntimeError):
+            pipeline.run("1", 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
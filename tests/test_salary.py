@@ -0,0 +1,98 @@
+import json
+import math
+import tempfile
+import unittest
+from pathlib import Path
+
+from main import load_currency_rates
+from src.api import HhApiError
+from src.salary import CurrencyRates, normalize_salaries, normalize_vacancies
+
+
+class UnavailableApiClient:
+    """Клиент API, у которого справочники недоступны."""
+
+    def get_dictionaries(self):
+        raise HhApiError("Ошибка запроса dictionaries: HTTP 503")
+
+
+class TestSalaryNormalization(unittest.TestCase):
+    def setUp(self):
+        self.rates = CurrencyRates({"USD": 0.01, "EUR": 0.008})
+
+    def test_normalize_salaries(self):
+        """Проверяет середину вилки, пересчет валют и вычет НДФЛ."""
+        result = normalize_salaries(
+            [
+                {"from": 100000, "to": 200000, "currency": "RUR", "gross": False},
+                {"from": 1000, "to": None, "currency": "USD", "gross": False},
+                {"from": None, "to": 800, "currency": "EUR", "gross": True},
+                {"from": 100000, "currency": "XXX"},
+                None,
+            ],
+            self.rates,
+        )
+        self.assertEqual(result[0], 150000)
+        self.assertAlmostEqual(result[1], 100000)
+        self.assertAlmostEqual(result[2], 87000)
+        self.assertTrue(math.isnan(result[3]))
+        self.assertTrue(math.isnan(result[4]))
+
+    def test_normalize_vacancies(self):
+        """Проверяет, что в строках сохраняются исходные поля зарплаты."""
+        rows = normalize_vacancies(
+            [
+                {"id": "1", "name": "A", "salary": {"from": 500, "currency": "USD"}},
+                {"id": "2", "name": "B", "salary": None},
+            ],
+            self.rates,
+        )
+        self.assertEqual(rows[0]["salary"], 50000)
+        self.assertEqual(rows[0]["salary_from"], 500)
+        self.assertEqual(rows[0]["salary_currency"], "USD")
+        self.assertIsNone(rows[1]["salary"])
+        self.assertEqual(normalize_vacancies([], self.rates), [])
+
+    def test_unknown_currency_keeps_raw_salary(self):
+        """Проверяет, что зарплата в валюте без курса не попадает в рублевый
+        столбец, но исходная вилка сохраняется.
+        """
+        vacancy = {
+            "id": "1",
+            "name": "A",
+            "salary": {"from": 1000, "to": 3000, "currency": "USD", "gross": True},
+        }
+        rates = CurrencyRates()
+        with self.assertLogs("src.salary", "WARNING") as logs:
+            rows = normalize_vacancies([vacancy], rates)
+        self.assertIsNone(rows[0]["salary"])
+        self.assertEqual(rows[0]["salary_from"], 1000)
+        self.assertEqual(rows[0]["salary_to"], 3000)
+        self.assertEqual(rows[0]["salary_currency"], "USD")
+        self.assertTrue(rows[0]["salary_gross"])
+        self.assertIn("USD", logs.output[0])
+
+    def test_rates_unavailable_logged(self):
+        """Проверяет предупреждение, если справочник hh.ru недоступен."""
+        with self.assertLogs("main", "WARNING"):
+            rates = load_currency_rates(UnavailableApiClient())
+        self.assertEqual(rates.rates, {"RUR": 1.0})
+
+    def test_rates_from_file(self):
+        """Проверяет чтение курсов из справочника hh.ru."""
+        dictionaries = {
+            "currency": [
+                {"code": "RUR", "rate": 1.0},
+                {"code": "USD", "rate": 0.0125},
+                {"code": "BYR", "rate": None},
+            ]
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "dictionaries.json"
+            path.write_text(json.dumps(dictionaries), encoding="utf-8")
+            rates = CurrencyRates.from_file(path)
+        self.assertEqual(rates.rates, {"RUR": 1.0, "USD": 0.0125})
+
+
+if __name__ == "__main__":
+    unittest.main()
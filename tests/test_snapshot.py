@@ -0,0 +1,78 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+from benchmarks.synthetic import generate_vacancies
+from src.snapshot import import_snapshot, read_snapshot, write_snapshot
+from tests.test_pipeline import RecordingDBManager
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+HAS_ZSTANDARD = importlib.util.find_spec("zstandard") is not None
+
+
+class SnapshotDBManager(RecordingDBManager):
+    """Приемник компаний и вакансий из снимка вместо базы данных."""
+
+    def __init__(self):
+        super().__init__()
+        self.companies = []
+
+    def insert_companies_bulk(self, companies, batch_size=1000):
+        start = len(self.companies)
+        self.companies.extend(companies)
+        return list(range(start, len(self.companies)))
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.vacancies = list(generate_vacancies("42", 25)) + list(
+            generate_vacancies("43", 5)
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _round_trip(self, filename: str) -> list:
+        path = Path(self.tmp_dir.name) / filename
+        self.assertEqual(write_snapshot(path, self.vacancies, batch_size=7), 30)
+        chunks = list(read_snapshot(path, batch_size=10))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 10])
+        return [vacancy for chunk in chunks for vacancy in chunk]
+
+    def test_ndjson_gzip(self):
+        """Проверяет запись и чтение сжатого NDJSON без потерь."""
+        self.assertEqual(self._round_trip("snapshot.ndjson.gz"), self.vacancies)
+
+    @unittest.skipUnless(HAS_ZSTANDARD, "zstandard не установлен")
+    def test_ndjson_zstd(self):
+        """Проверяет запись и чтение NDJSON, сжатого zstd."""
+        self.assertEqual(self._round_trip("snapshot.ndjson.zst"), self.vacancies)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow не установлен")
+    def test_parquet(self):
+        """Проверяет, что колоночный снимок сохраняет загружаемые поля."""
+        restored = self._round_trip("snapshot.parquet")
+        for original, vacancy in zip(self.vacancies, restored):
+            self.assertEqual(vacancy["id"], original["id"])
+            self.assertEqual(vacancy["salary"], original["salary"])
+            self.assertEqual(vacancy["published_at"], original["published_at"])
+            self.assertEqual(vacancy["employer"], original["employer"])
+
+    def test_import_snapshot(self):
+        """Проверяет загрузку снимка в базу пачками по компаниям."""
+        path = Path(self.tmp_dir.name) / "snapshot.ndjson"
+        write_snapshot(path, self.vacancies)
+        db_manager = SnapshotDBManager()
+        self.assertEqual(import_snapshot(db_manager, path, batch_size=20), 30)
+        self.assertEqual(
+            [company["id"] for company in db_manager.companies], ["42", "42", "43"]
+        )
+        self.assertEqual(
+            [len(rows) for _, rows in db_manager.batches], [20, 5, 5]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
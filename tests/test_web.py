@@ -0,0 +1,110 @@
+import unittest
+from collections import Counter
+
+from src.cache import QueryCache
+from src.web import create_app
+
+
+class CountingDBManager:
+    """Заглушка DBManager, считающая обращения к базе данных."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.companies = [
+            {"id": i, "name": f"Компания {i}", "vacancies_count": i} for i in range(1, 6)
+        ]
+
+    def get_statistics(self):
+        self.calls["get_statistics"] += 1
+        return {"num_companies": len(self.companies), "num_vacancies": 15}
+
+    def get_avg_salary(self):
+        self.calls["get_avg_salary"] += 1
+        return 100000.0
+
+    def get_companies_and_vacancies_count(self, limit=None, after_id=None):
+        self.calls["get_companies_and_vacancies_count"] += 1
+        rows = [c for c in self.companies if after_id is None or c["id"] > after_id]
+        return rows[:limit]
+
+    def get_vacancies_with_keyword(self, keyword, limit=None, after_id=None):
+        self.calls["get_vacancies_with_keyword"] += 1
+        return [{"id": 1, "title": f"{keyword} developer"}]
+
+    def get_vacancies_with_higher_salary(self, limit=None, after_id=None):
+        self.calls["get_vacancies_with_higher_salary"] += 1
+        return []
+
+
+class TestReadApi(unittest.TestCase):
+    def setUp(self):
+        self.db_manager = CountingDBManager()
+        self.app = create_app(self.db_manager, cache_ttl=60)
+        self.client = self.app.test_client()
+
+    def test_statistics_cached(self):
+        """Проверяет, что повторный запрос статистики не обращается к базе."""
+        for _ in range(3):
+            response = self.client.get("/api/statistics")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.get_json(),
+            {"num_companies": 5, "num_vacancies": 15, "avg_salary": 100000.0},
+        )
+        self.assertEqual(self.db_manager.calls["get_statistics"], 1)
+
+    def test_invalidate(self):
+        """Проверяет, что после сброса кэша данные читаются из базы заново."""
+        self.client.get("/api/statistics")
+        response = self.client.post("/api/cache/invalidate")
+        self.assertEqual(response.status_code, 200)
+        self.client.get("/api/statistics")
+        self.assertEqual(self.db_manager.calls["get_statistics"], 2)
+
+    def test_companies_pagination(self):
+        """Проверяет постраничную выдачу компаний по ключу after_id."""
+        first = self.client.get("/api/companies?limit=2").get_json()
+        self.assertEqual([c["id"] for c in first["items"]], [1, 2])
+        self.assertEqual(first["next_after_id"], 2)
+        last = self.client.get("/api/companies?limit=2&after_id=4").get_json()
+        self.assertEqual([c["id"] for c in last["items"]], [5])
+        self.assertIsNone(last["next_after_id"])
+
+    def test_vacancies(self):
+        """Проверяет поиск вакансий и кэширование по параметрам запроса."""
+        self.client.get("/api/vacancies?keyword=python")
+        self.client.get("/api/vacancies?keyword=python")
+        response = self.client.get("/api/vacancies?keyword=java")
+        self.assertEqual(response.get_json()["items"][0]["title"], "java developer")
+        self.assertEqual(self.db_manager.calls["get_vacancies_with_keyword"], 2)
+        response = self.client.get("/api/vacancies?higher_salary=1")
+        self.assertEqual(response.get_json(), {"items": [], "next_after_id": None})
+
+    def test_bad_request(self):
+        """Проверяет ответ 400 на некорректные параметры."""
+        self.assertEqual(self.client.get("/api/vacancies").status_code, 400)
+        self.assertEqual(self.client.get("/api/companies?limit=0").status_code, 400)
+        self.assertEqual(self.client.get("/api/companies?after_id=x").status_code, 400)
+
+
+class TestQueryCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        """Проверяет вытеснение давно не использованных записей."""
+        cache = QueryCache(ttl=60, max_entries=2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+        cache.get_or_compute("a", lambda: 0)
+        cache.get_or_compute("c", lambda: 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get_or_compute("a", lambda: 0), 1)
+        self.assertEqual(cache.get_or_compute("b", lambda: 0), 0)
+
+    def test_ttl(self):
+        """Проверяет, что устаревшая запись вычисляется заново."""
+        cache = QueryCache(ttl=0)
+        cache.get_or_compute("a", lambda: 1)
+        self.assertEqual(cache.get_or_compute("a", lambda: 2), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()